@@ -1,13 +1,18 @@
-import requests, json, os
+import json, os, sys
 from datetime import datetime
 from bs4 import BeautifulSoup
 
+# The shared HTTP client lives with the blog tooling in src/github
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "github"))
+from httpclient import get_http_client
+from assetstore import store_download
+
 def get_image_urls(url):
 
     urllist = []
 
     headers = {'User-Agent': 'curl/7.84.0'}
-    page = requests.get(url, headers=headers, allow_redirects=True)
+    page = get_http_client().get(url, headers=headers, allow_redirects=True)
     soup = BeautifulSoup(page.content, 'html.parser')
     body = soup.find("body")
     sc = list(body.find_all("script"))[-1].string
@@ -28,13 +33,14 @@ def download_image(urllist):
     os.chdir(curdate)
 
     headers = {'User-Agent': 'curl/7.84.0'}
-    i = 1
     for url in urllist:
-        page = requests.get(url, headers=headers, allow_redirects=True)
-        with open("apple-blog/public/assets/"+str(i) + ".png", 'wb') as f:
-            f.write(page.content)
-        i+=1
-        print(f"Downloaded {i}.png")
+        # Streamed and stored by content hash, so repeated showcase images are kept once
+        try:
+            name = store_download(url, "apple-blog/public/assets", headers=headers)
+        except Exception as e:
+            print(f"Failed to download {url}: {e}")
+            continue
+        print(f"Downloaded {name}")
 
 url = 'https://www.midjourney.com/showcase/recents'
 url2 = 'https://www.midjourney.com/showcase/top'
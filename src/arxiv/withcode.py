@@ -1,13 +1,17 @@
 import arxivscraper
 import datetime
 import time
-import requests
 import json
 from datetime import timedelta
 import os
 import pathlib
+import sys
 import yaml
 
+# The shared HTTP client lives with the blog tooling in src/github
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "github"))
+from httpclient import get_http_client
+
 
 def get_daily_code(DateToday, cats):
     """
@@ -47,7 +51,7 @@ def get_daily_code(DateToday, cats):
             paper_date = paper_date.strftime("%Y-%m-%d")
         url = base_url + _id
         try:
-            r = requests.get(url).json()
+            r = get_http_client().get(url).json()
             if "official" in r and r["official"]:
                 cnt += 1
                 repo_url = r["official"]["url"]
@@ -0,0 +1,195 @@
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+MANIFEST_NAME = "assets-manifest.json"
+# label -> (width, height); height None keeps the aspect ratio, both set
+# crops to fill.  Images are never upscaled.
+DEFAULT_VARIANTS = {
+    "large": (1200, None),
+    "small": (480, None),
+    "square": (512, 512),
+}
+RASTER_EXTENSIONS = frozenset({".png", ".jpg", ".jpeg", ".webp"})
+
+
+def variant_name(name: str, label: str) -> str:
+    return f"{os.path.splitext(name)[0]}-{label}.webp"
+
+
+def make_variants(source_path: str, folder: str, variants: dict, quality: int = 80) -> dict:
+    """Write the WebP variants of one image; runs inside a pool process.
+
+    Returns the source dimensions and ``{label: {file, width, height}}``.
+    """
+    from PIL import Image, ImageOps
+
+    name = os.path.basename(source_path)
+    with Image.open(source_path) as image:
+        # Phone photos carry their rotation in EXIF, which WebP output drops
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or "A" in image.mode else "RGB")
+        width, height = image.size
+        written = {}
+        for label, (target_width, target_height) in variants.items():
+            if target_height is None:
+                scale = min(1.0, target_width / width)
+                size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                resized = image.resize(size, Image.LANCZOS) if scale < 1.0 else image
+            else:
+                side = min(width, height)
+                size = (min(target_width, side), min(target_height, side))
+                resized = ImageOps.fit(image, size, Image.LANCZOS)
+            file_name = variant_name(name, label)
+            fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    resized.save(file, format="WEBP", quality=quality, method=6)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, os.path.join(folder, file_name))
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            written[label] = {"file": file_name, "width": resized.width, "height": resized.height}
+    return {"width": width, "height": height, "variants": written}
+
+
+class AssetOptimizer:
+    """Downscaled WebP copies of the images in ``assets_save_folder``.
+
+    Covers come in at 1024x1024 and charts at 300 dpi; every raster image
+    passed to ``optimize`` gets the ``variants`` sizes written next to it as
+    ``<stem>-<label>.webp``, with the work spread over a process pool.  The
+    manifest records each source's size, mtime and dimensions plus the
+    variants made from it, so unchanged images are skipped on later runs.
+    Originals are left in place.
+    """
+
+    def __init__(self, assets_save_folder: str, processes: int = 2, variants: dict = None,
+                 quality: int = 80):
+        self.assets_save_folder = assets_save_folder
+        self.path = os.path.join(assets_save_folder, MANIFEST_NAME)
+        self.processes = processes
+        self.variants = variants or DEFAULT_VARIANTS
+        self.quality = quality
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    self.entries = json.load(file).get("images", {})
+            except (ValueError, OSError) as e:
+                logging.warning(f"Ignoring unreadable asset manifest {self.path}: {e}")
+
+    def _source_stat(self, name: str):
+        try:
+            stat = os.stat(os.path.join(self.assets_save_folder, name))
+        except OSError:
+            return None
+        return {"size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+    def is_current(self, name: str) -> bool:
+        entry = self.entries.get(name)
+        if entry is None or entry.get("source") != self._source_stat(name):
+            return False
+        variants = entry.get("variants") or {}
+        return set(variants) >= set(self.variants) and all(
+            os.path.exists(os.path.join(self.assets_save_folder, variants[label]["file"]))
+            for label in self.variants
+        )
+
+    def _is_variant(self, name: str) -> bool:
+        return any(
+            name == variant["file"]
+            for entry in self.entries.values()
+            for variant in (entry.get("variants") or {}).values()
+        )
+
+    def optimize(self, names) -> dict:
+        """Make missing or outdated variants; returns ``{name: entry}`` for every usable name."""
+        todo, done = [], {}
+        for name in dict.fromkeys(n for n in names if n):
+            if os.path.splitext(name)[1].lower() not in RASTER_EXTENSIONS or self._is_variant(name):
+                continue
+            if self._source_stat(name) is None:
+                continue
+            if self.is_current(name):
+                done[name] = self.entries[name]
+            else:
+                todo.append(name)
+        if not todo:
+            return done
+
+        def record(name, result):
+            entry = dict(result, source=self._source_stat(name))
+            with self._lock:
+                self.entries[name] = entry
+                self._dirty = True
+            done[name] = entry
+
+        jobs = [
+            (name, os.path.join(self.assets_save_folder, name), self.assets_save_folder,
+             self.variants, self.quality)
+            for name in todo
+        ]
+        if self.processes == 0 or len(todo) == 1:
+            for name, *args in jobs:
+                try:
+                    record(name, make_variants(*args))
+                except Exception as e:
+                    logging.error(f"Could not optimize {name}: {e}")
+        else:
+            # spawn: forking a process that already runs pipeline threads can deadlock
+            with ProcessPoolExecutor(
+                max_workers=min(self.processes or os.cpu_count() or 1, len(todo)),
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = {executor.submit(make_variants, *args): name for name, *args in jobs}
+                for future, name in futures.items():
+                    try:
+                        record(name, future.result())
+                    except Exception as e:
+                        logging.error(f"Could not optimize {name}: {e}")
+        self.save()
+        return done
+
+    def variant(self, name: str, label: str) -> str:
+        """File name of one variant of ``name``, or None when it hasn't been made."""
+        entry = self.entries.get(name) or {}
+        variant = (entry.get("variants") or {}).get(label)
+        return variant["file"] if variant else None
+
+    def prune(self) -> list:
+        """Delete the variants of sources that are gone; returns removed paths."""
+        removed = []
+        with self._lock:
+            for name in list(self.entries):
+                if self._source_stat(name) is not None:
+                    continue
+                for variant in (self.entries[name].get("variants") or {}).values():
+                    path = os.path.join(self.assets_save_folder, variant["file"])
+                    if os.path.exists(path):
+                        os.remove(path)
+                        removed.append(path)
+                del self.entries[name]
+                self._dirty = True
+        return removed
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.assets_save_folder, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.assets_save_folder, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"images": self.entries}, file, ensure_ascii=False,
+                          indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
@@ -0,0 +1,82 @@
+import hashlib
+import logging
+import mimetypes
+import os
+import tempfile
+from urllib.parse import urlparse
+
+from httpclient import get_http_client
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+# mimetypes knows these, but its picks (".jpe", ...) vary by platform
+IMAGE_EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+    "image/svg+xml": ".svg",
+    "image/avif": ".avif",
+}
+
+
+class DownloadTooLarge(Exception):
+    pass
+
+
+def _extension(url: str, content_type: str) -> str:
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    if content_type in IMAGE_EXTENSIONS:
+        return IMAGE_EXTENSIONS[content_type]
+    suffix = os.path.splitext(urlparse(url).path)[1].lower()
+    if suffix and len(suffix) <= 6:
+        return suffix
+    return mimetypes.guess_extension(content_type) or ".png"
+
+
+def store_download(url: str, folder: str, max_bytes: int = DEFAULT_MAX_BYTES,
+                   headers: dict = None, client=None) -> str:
+    """Stream ``url`` into ``folder`` under the sha256 of its content.
+
+    Chunks go to a temp file in ``folder`` while being hashed, so memory stays
+    flat and a half-written file is never visible.  Downloads over
+    ``max_bytes`` (declared or actual) raise DownloadTooLarge; other HTTP
+    failures raise ``requests.HTTPError``.  Returns the stored file name,
+    ``<sha256><ext>``; identical content is kept once.
+    """
+    client = client or get_http_client()
+    os.makedirs(folder, exist_ok=True)
+    response = client.get(url, headers=headers, stream=True, allow_redirects=True)
+    try:
+        response.raise_for_status()
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > max_bytes:
+            raise DownloadTooLarge(f"{url} is {declared} bytes, limit is {max_bytes}")
+
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise DownloadTooLarge(f"{url} exceeds {max_bytes} bytes")
+                    digest.update(chunk)
+                    file.write(chunk)
+            name = digest.hexdigest() + _extension(url, response.headers.get("Content-Type"))
+            path = os.path.join(folder, name)
+            if os.path.exists(path):
+                logging.info(f"{url} is already stored as {name}")
+                os.remove(tmp_path)
+            else:
+                # mkstemp creates 0600; assets are served by the site build
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    finally:
+        response.close()
+    return name
@@ -0,0 +1,98 @@
+"""Benchmark the commit heatmap grid against the old per-day loop.
+
+    python src/github/bench_heatmap.py --commits=100000 --years=3
+"""
+import random
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from fire import Fire
+
+from commitlog import CommitColumns, CommitRecord
+
+
+def synthetic_commits(count: int, years: int = 3, authors: int = 50, seed: int = 0):
+    rng = random.Random(seed)
+    end = datetime(2024, 12, 31, 23, 0, 0)
+    span = years * 365 * 24 * 3600
+    names = [f"dev{i}" for i in range(authors)]
+    stamps = sorted(end - timedelta(seconds=rng.randrange(span)) for _ in range(count))
+    return [
+        CommitRecord(f"{i:040x}", rng.choice(names),
+                     stamp.strftime("%Y-%m-%d %H:%M:%S +0800"), f"commit {i}")
+        for i, stamp in enumerate(stamps)
+    ]
+
+
+def legacy_heatmap_table(commits):
+    """The heatmap matrix as generate_commit_heatmap used to build it.
+
+    Two fixes keep it comparable with calendar_grid: the counts are keyed by
+    date, because the old datetime keys never matched ``day.date()``, and
+    ``pivot_table(aggfunc="sum")`` adds up the two ends of the range that
+    share an ISO week number, where ``pivot`` raised "Index contains
+    duplicate entries".
+    """
+    dates = [datetime.strptime(commit['date'][:10], '%Y-%m-%d').date() for commit in commits]
+    date_counts = Counter(dates)
+    end_date = max(dates)
+    start_date = end_date - timedelta(days=365)
+    date_range = pd.date_range(start=start_date, end=end_date)
+    weeks = []
+    for day in date_range:
+        weeks.append([day.weekday(), day.isocalendar()[1], date_counts.get(day.date(), 0)])
+    df = pd.DataFrame(weeks, columns=['weekday', 'week', 'commits'])
+    return df.pivot_table(index='weekday', columns='week', values='commits',
+                          aggfunc='sum', fill_value=0)
+
+
+def grid_by_iso_week(grid, week_starts):
+    """Fold calendar_grid columns onto ISO week numbers, the legacy layout."""
+    weeks = {}
+    for column, start in enumerate(week_starts.astype("datetime64[D]").tolist()):
+        week = start.isocalendar()[1]
+        weeks[week] = weeks.get(week, 0) + grid[:, column]
+    return np.stack([weeks[week] for week in sorted(weeks)], axis=1)
+
+
+def _timed(func, repeat):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main(commits=100000, years=3, repeat=3, seed=0):
+    history = synthetic_commits(commits, years=years, seed=seed)
+    print(f"{len(history)} commits over {years} year(s)")
+
+    legacy_time, legacy_table = _timed(lambda: legacy_heatmap_table(history), repeat)
+    columns_time, columns = _timed(lambda: CommitColumns.from_commits(history), repeat)
+    grid_time, (grid, week_starts) = _timed(lambda: columns.calendar_grid(), repeat)
+    full_time, (full_grid, _) = _timed(
+        lambda: columns.calendar_grid(start=columns.days.min()), repeat
+    )
+
+    # Same counts per weekday and ISO week as the old table
+    legacy_grid = legacy_table.to_numpy()
+    assert np.array_equal(grid_by_iso_week(grid, week_starts), legacy_grid)
+    assert int(full_grid.sum()) == len(history)
+
+    print(f"legacy loop:          {legacy_time * 1000:9.1f} ms  "
+          f"({int(legacy_grid.sum())} commits, {legacy_grid.shape[1]} ISO weeks)")
+    print(f"CommitColumns build:  {columns_time * 1000:9.1f} ms")
+    print(f"calendar_grid (1y):   {grid_time * 1000:9.1f} ms  "
+          f"({int(grid.sum())} commits, {len(week_starts)} weeks)")
+    print(f"calendar_grid (all):  {full_time * 1000:9.1f} ms  "
+          f"({int(full_grid.sum())} commits, {full_grid.shape[1]} weeks)")
+    print(f"speedup (1y grid):    {legacy_time / grid_time:9.0f}x, "
+          f"{legacy_time / (columns_time + grid_time):.1f}x including the column build")
+
+
+if __name__ == "__main__":
+    Fire(main)
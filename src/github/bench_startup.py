@@ -0,0 +1,62 @@
+"""Measure cold-start import time of the daily blog entry point.
+
+    python src/github/bench_startup.py --runs=5 --top=15
+
+Each run imports the module in a fresh interpreter under ``-X importtime``
+and reports the wall time, the cumulative import time and the slowest
+imports.  Plotting libraries showing up in the list means something pulls
+them in at import time again.
+"""
+import os
+import subprocess
+import sys
+import time
+
+from fire import Fire
+
+HEAVY_MODULES = ("matplotlib", "seaborn", "networkx", "pandas", "plotly", "mplcyberpunk", "kaleido")
+
+
+def parse_importtime(stderr: str) -> dict:
+    """``{module: cumulative microseconds}`` from ``-X importtime`` output."""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if cumulative_us.strip().isdigit():
+            cumulative[name.strip()] = int(cumulative_us)
+    return cumulative
+
+
+def measure(module: str, cwd: str) -> tuple:
+    code = f"import sys; sys.path.insert(0, {os.path.dirname(os.path.abspath(__file__))!r}); import {module}"
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=cwd, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return wall, parse_importtime(result.stderr)
+
+
+def main(module="daily_github_appleblog", runs=5, top=15, cwd=None):
+    # config.yml is read relative to the working directory, like the workflow does
+    cwd = cwd or os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+    walls, imports = [], None
+    for _ in range(runs):
+        wall, cumulative = measure(module, cwd)
+        walls.append(wall)
+        imports = cumulative
+    walls.sort()
+    print(f"{module}: wall min {walls[0] * 1000:.0f} ms, median {walls[len(walls) // 2] * 1000:.0f} ms "
+          f"over {runs} runs; import {imports.get(module, 0) / 1000:.0f} ms")
+    print("slowest imports (cumulative):")
+    for name, micros in sorted(imports.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+    heavy = sorted({name.split(".")[0] for name in imports} & set(HEAVY_MODULES))
+    print("plotting stack loaded at import: " + (", ".join(heavy) if heavy else "none"))
+
+
+if __name__ == "__main__":
+    Fire(main)
@@ -1,34 +1,77 @@
-import requests
-from datetime import datetime, timedelta
-import subprocess
-import plotly.figure_factory as ff
-import plotly.io as pio
+from datetime import datetime
 import logging
 import os
-import networkx as nx
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-from collections import Counter, defaultdict
 import calendar
-import mplcyberpunk
 import re
-import plotly.express as px
-import plotly.graph_objects as go
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from httpclient import get_http_client
+from llmcache import get_default_cache
+from commitlog import CommitColumns, iter_commits
+from chartrender import CHART_JOBS, get_chart_renderer
+from chartcache import commits_fingerprint, get_chart_cache
+from figureexport import export_figure, export_figures
+from svgcharts import write_svg_charts
+from readmecontext import ReadmeContext, estimate_tokens
+import numpy as np
+
+# matplotlib, seaborn, networkx, pandas and plotly are imported inside the
+# chart methods, so importing this module (or using the SVG backend) doesn't
+# pay for the plotting stack
 
 logging.basicConfig(level=logging.DEBUG)
 
+# Model asked for by every blog prompt; part of the LLM cache key
+CHAT_MODEL = "gpt-4o-mini"
+
+# pyplot keeps global figure state, so posts generated from pipeline threads
+# have to take turns while rendering charts
+_CHART_LOCK = threading.Lock()
+
+
+def _pyplot():
+    """pyplot with the "cyberpunk" style registered."""
+    import matplotlib.pyplot as plt
+    import mplcyberpunk  # noqa: F401  (registers the style)
+
+    return plt
+
+# The contributor network only draws the most active authors and their
+# heaviest edges, with a fixed layout budget, so it renders in bounded time
+# however long the history is
+NETWORK_MAX_AUTHORS = 40
+NETWORK_MAX_EDGES = 120
+NETWORK_LAYOUT_ITERATIONS = 50
+NETWORK_LAYOUT_SEED = 42
+
 class EnhancedBlogGenerator:
     def __init__(self, current_date: str, username: str, 
                  api_url: str, api_key: str,
                  model_name: str = "gpt-4",
-                 temperature: float = 0.7):
+                 temperature: float = 0.7,
+                 section_workers: int = 6,
+                 cache=None,
+                 chart_renderer=None,
+                 chart_backend: str = "png",
+                 readme_tokens: int = 1500):
         self.current_date = current_date
         self.username = username
         self.api_url = api_url
         self.api_key = api_key
         self.model_name = model_name
         self.temperature = temperature
+        # <= 1 keeps the old one-prompt-at-a-time behaviour
+        self.section_workers = section_workers
+        # None picks the shared default, False turns the feature off
+        self.cache = (cache if cache is not None else get_default_cache()) or None
+        self.chart_renderer = (chart_renderer if chart_renderer is not None else get_chart_renderer()) or None
+        # "png": matplotlib/plotly images, "svg": lightweight vector charts from svgcharts
+        self.chart_backend = chart_backend
+        # The README is condensed to this many tokens once and shared by every prompt
+        self.readme_tokens = readme_tokens
+        # Prompts actually sent (LLM cache hits excluded); the API's own count when it gives one
+        self.usage = {'calls': 0, 'prompt_tokens': 0}
+        self._usage_lock = threading.Lock()
     def calculate_reading_time(self,text: str, words_per_minute: int = 200) -> tuple:
         """
         Calculate the estimated reading time for a text.
@@ -101,30 +144,33 @@ class EnhancedBlogGenerator:
             logging.error(f"Error formatting time: {e}")
             return "Unknown reading time"
 
-    def generate_commit_heatmap(self, commits, repo_name, assets_save_folder, assets_read_folder):
-        """Generate a GitHub-style commit heatmap."""
+    def generate_commit_heatmap(self, commits, repo_name, assets_save_folder, assets_read_folder,
+                                start=None, end=None):
+        """Generate a GitHub-style commit heatmap.
+
+        Covers the year up to the last commit unless ``start``/``end`` are given.
+        """
         try:
-            # Convert commits to dates and count
-            dates = [datetime.strptime(commit['date'][:10], '%Y-%m-%d') for commit in commits]
-            date_counts = Counter(dates)
-            
-            # Create date range for the past year
-            end_date = max(dates)
-            start_date = end_date - timedelta(days=365)
-            date_range = pd.date_range(start=start_date, end=end_date)
-            
-            # Create matrix for heatmap
-            weeks = []
-            for day in date_range:
-                weeks.append([day.weekday(), day.isocalendar()[1], date_counts.get(day.date(), 0)])
-            
-            df = pd.DataFrame(weeks, columns=['weekday', 'week', 'commits'])
-            pivot_table = df.pivot(index='weekday', columns='week', values='commits')
+            import pandas as pd
+            import seaborn as sns
+
+            plt = _pyplot()
+            columns = CommitColumns.from_commits(commits)
+            grid, week_starts = columns.calendar_grid(start=start, end=end)
+            
+            # Label a column only where a new month begins
+            months = week_starts.astype("datetime64[M]")
+            new_month = np.r_[True, months[1:] != months[:-1]]
+            week_labels = [
+                pd.Timestamp(week).strftime("%b %Y") if label else ""
+                for week, label in zip(week_starts, new_month)
+            ]
+            pivot_table = pd.DataFrame(grid, index=list(calendar.day_abbr), columns=week_labels)
             
             # Create heatmap
             plt.style.use("cyberpunk")
             plt.figure(figsize=(15, 4))
-            sns.heatmap(pivot_table, cmap='YlOrRd', linewidths=1)
+            sns.heatmap(pivot_table, cmap='YlOrRd', linewidths=1, xticklabels=True)
             
             # Save and return path
             output_path = os.path.join(assets_save_folder, f"{repo_name}-commit_heatmap.png")
@@ -137,33 +183,37 @@ class EnhancedBlogGenerator:
             logging.error(f"Error generating commit heatmap: {e}")
             return ""
 
-    def generate_contribution_network(self, commits, repo_name, assets_save_folder, assets_read_folder):
+    def generate_contribution_network(self, commits, repo_name, assets_save_folder, assets_read_folder,
+                                      max_authors=NETWORK_MAX_AUTHORS, max_edges=NETWORK_MAX_EDGES):
         """Generate a network diagram of contributor interactions."""
         try:
+            import networkx as nx
+
+            plt = _pyplot()
+            columns = CommitColumns.from_commits(commits)
             G = nx.Graph()
             
-            # Create edges between consecutive commit authors
-            for i in range(len(commits)-1):
-                author1 = commits[i]['author']
-                author2 = commits[i+1]['author']
-                if author1 != author2:
-                    if G.has_edge(author1, author2):
-                        G[author1][author2]['weight'] += 1
-                    else:
-                        G.add_edge(author1, author2, weight=1)
+            # Top contributors and the heaviest edges between consecutive commit authors
+            commit_counts, top_authors, edges, weights = columns.contributor_graph(max_authors, max_edges)
+            G.add_nodes_from(columns.authors[code] for code in top_authors)
+            for (code1, code2), weight in zip(edges, weights):
+                G.add_edge(columns.authors[code1], columns.authors[code2], weight=int(weight))
+            max_weight = int(weights[0]) if len(weights) else 1
             
             plt.style.use("cyberpunk")
             plt.figure(figsize=(12, 8))
             
-            pos = nx.spring_layout(G)
+            pos = nx.spring_layout(G, iterations=NETWORK_LAYOUT_ITERATIONS, seed=NETWORK_LAYOUT_SEED)
+            max_commits = int(commit_counts.max()) if len(commit_counts) else 1
+            author_codes = {author: code for code, author in enumerate(columns.authors)}
             nx.draw(G, pos, 
                    with_labels=True,
                    node_color='cyan',
-                   node_size=1000,
+                   node_size=[300 + 1700 * commit_counts[author_codes[n]] / max_commits for n in G.nodes()],
                    font_size=8,
                    font_weight='bold',
                    edge_color='white',
-                   width=[G[u][v]['weight'] for u,v in G.edges()])
+                   width=[0.5 + 5.5 * G[u][v]['weight'] / max_weight for u,v in G.edges()])
             
             output_path = os.path.join(assets_save_folder, f"{repo_name}-contribution_network.png")
             return_path = os.path.join(assets_read_folder, f"{repo_name}-contribution_network.png")
@@ -175,43 +225,36 @@ class EnhancedBlogGenerator:
             logging.error(f"Error generating contribution network: {e}")
             return ""
 
+    def build_commit_activity_figure(self, commits):
+        """Build the day/hour commit activity heatmap figure."""
+        import plotly.graph_objects as go
+
+        columns = CommitColumns.from_commits(commits)
+        # Count commits per (weekday, hour) cell
+        cells = columns.weekdays * 24 + columns.hours
+        z_data = np.bincount(cells, minlength=7 * 24).reshape(7, 24).tolist()
+        days_order = list(calendar.day_name)
+        hours_range = list(range(24))
+        
+        fig = go.Figure(data=go.Heatmap(
+            z=z_data,
+            x=[f"{i:02d}:00" for i in hours_range],
+            y=days_order,
+            colorscale='Viridis'
+        ))
+        
+        fig.update_layout(
+            title='Commit Activity by Day and Hour',
+            xaxis_title='Hour of Day',
+            yaxis_title='Day of Week',
+            template='plotly_dark'
+        )
+        return fig
+
     def generate_commit_activity_chart(self, commits, repo_name, assets_save_folder, assets_read_folder):
         """Generate an interactive commit activity chart using Plotly."""
         try:
-            # Process commit data
-            dates = [datetime.strptime(commit['date'][:19], '%Y-%m-%d %H:%M:%S') for commit in commits]
-            hours = [d.hour for d in dates]
-            days = [calendar.day_name[d.weekday()] for d in dates]
-            
-            # Create heatmap data
-            activity_matrix = defaultdict(lambda: defaultdict(int))
-            for day, hour in zip(days, hours):
-                activity_matrix[day][hour] += 1
-            
-            # Convert to Plotly format
-            z_data = []
-            days_order = list(calendar.day_name)
-            hours_range = list(range(24))
-            
-            for day in days_order:
-                row = []
-                for hour in hours_range:
-                    row.append(activity_matrix[day][hour])
-                z_data.append(row)
-            
-            fig = go.Figure(data=go.Heatmap(
-                z=z_data,
-                x=[f"{i:02d}:00" for i in hours_range],
-                y=days_order,
-                colorscale='Viridis'
-            ))
-            
-            fig.update_layout(
-                title='Commit Activity by Day and Hour',
-                xaxis_title='Hour of Day',
-                yaxis_title='Day of Week',
-                template='plotly_dark'
-            )
+            fig = self.build_commit_activity_figure(commits)
             
             # Save both HTML and image versions
             html_output = os.path.join(assets_save_folder, f"{repo_name}-commit_activity.html")
@@ -219,48 +262,53 @@ class EnhancedBlogGenerator:
             return_path = os.path.join(assets_read_folder, f"{repo_name}-commit_activity.png")
             
             # pio.write_html(fig, html_output)
-            pio.write_image(fig, img_output)
+            export_figure(fig, img_output)
             
             return return_path
         except Exception as e:
             logging.error(f"Error generating commit activity chart: {e}")
             return ""
 
+    def build_code_frequency_figure(self, commits):
+        """Build the commits-per-day line figure."""
+        import pandas as pd
+        import plotly.graph_objects as go
+
+        # This would require git log with --numstat
+        # For demonstration, we'll use commit counts
+        columns = CommitColumns.from_commits(commits)
+        days, counts = np.unique(columns.days, return_counts=True)
+        df = pd.DataFrame({'date': pd.DatetimeIndex(days), 'commits': counts})
+        
+        fig = go.Figure()
+        
+        fig.add_trace(go.Scatter(
+            x=df['date'],
+            y=df['commits'],
+            mode='lines',
+            name='Commits',
+            line=dict(width=2, color='cyan'),
+            fill='tozeroy'
+        ))
+        
+        fig.update_layout(
+            title='Code Frequency Over Time',
+            xaxis_title='Date',
+            yaxis_title='Number of Commits',
+            template='plotly_dark',
+            showlegend=True
+        )
+        return fig
+
     def generate_code_frequency_chart(self, commits, repo_name, assets_save_folder, assets_read_folder):
         """Generate a chart showing code additions/deletions over time."""
         try:
-            # This would require git log with --numstat
-            # For demonstration, we'll use commit counts
-            dates = [datetime.strptime(commit['date'][:10], '%Y-%m-%d') for commit in commits]
-            date_counts = Counter(dates)
-            
-            df = pd.DataFrame.from_dict(date_counts, orient='index').reset_index()
-            df.columns = ['date', 'commits']
-            df = df.sort_values('date')
-            
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatter(
-                x=df['date'],
-                y=df['commits'],
-                mode='lines',
-                name='Commits',
-                line=dict(width=2, color='cyan'),
-                fill='tozeroy'
-            ))
-            
-            fig.update_layout(
-                title='Code Frequency Over Time',
-                xaxis_title='Date',
-                yaxis_title='Number of Commits',
-                template='plotly_dark',
-                showlegend=True
-            )
+            fig = self.build_code_frequency_figure(commits)
             
             output_path = os.path.join(assets_save_folder, f"{repo_name}-code_frequency.png")
             return_path = os.path.join(assets_read_folder, f"{repo_name}-code_frequency.png")
             
-            pio.write_image(fig, output_path)
+            export_figure(fig, output_path)
             
             return return_path
         except Exception as e:
@@ -269,21 +317,32 @@ class EnhancedBlogGenerator:
 
     
     def _call_api(self, prompt: str, max_tokens: int = 200) -> str:
-        """Call the external API with a specific prompt."""
+        """Call the external API with a specific prompt, answering from the LLM cache when possible."""
+        if self.cache is None:
+            return self._request_completion(prompt, max_tokens)
+        return self.cache.get_or_call(
+            CHAT_MODEL, prompt, self.temperature,
+            lambda: self._request_completion(prompt, max_tokens),
+            max_tokens=max_tokens)
+
+    def _request_completion(self, prompt: str, max_tokens: int = 200) -> str:
+        """Send one prompt to the chat endpoint."""
         try:
             headers = {
                 "Authorization": f"Bearer {self.api_key}",
                 "Content-Type": "application/json"
             }
-            data = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": prompt}]}
+            data = {"model": CHAT_MODEL, "messages": [{"role": "user", "content": prompt}]}
             print('start duckduck===')
 
-            response = requests.post(self.api_url, json=data, headers=headers)
+            # Shared keep-alive pool, so parallel section prompts reuse connections
+            response = get_http_client().post(self.api_url, json=data, headers=headers, idempotent=True)
             print('status',response.status_code)
             if response.status_code == 200:
             
                 print('response===',response.json())
                 response.raise_for_status()
+                self._record_usage(prompt, response)
                 try:
                     data=response.json()["choices"][0]["message"]["content"].strip()
                     return data
@@ -296,56 +355,71 @@ class EnhancedBlogGenerator:
             logging.error(f"API call failed: {e}")
             return ""
 
-    def get_commit_history(self, repo_path: str):
-        """Get repository commit history."""
+    def _record_usage(self, prompt: str, response):
         try:
-            cmd = [
-                'git', '-C', repo_path, 'log', 
-                '--pretty=format:{%n  "hash": "%H",%n  "author": "%an",%n  "date": "%ai",%n  "message": "%s"%n}',
-                '--reverse'
-            ]
-            output = subprocess.check_output(cmd, universal_newlines=True)
-            commits = []
-            for commit in output.strip().split('\n\n'):
-                try:
-                    commit_dict = eval(commit)
-                    commits.append(commit_dict)
-                except Exception as e:
-                    logging.warning(f"Error parsing commit: {e}")
-                    continue
-            return commits
+            tokens = int(response.json()["usage"]["prompt_tokens"])
+        except (ValueError, KeyError, TypeError):
+            tokens = estimate_tokens(prompt)
+        with self._usage_lock:
+            self.usage['calls'] += 1
+            self.usage['prompt_tokens'] += tokens
+
+    def _call_api_batch(self, requests_list: list) -> list:
+        """Send independent (prompt, max_tokens) pairs concurrently, results in input order."""
+        if self.section_workers <= 1 or len(requests_list) <= 1:
+            return [self._call_api(prompt, max_tokens=max_tokens) for prompt, max_tokens in requests_list]
+        workers = min(self.section_workers, len(requests_list))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._call_api, prompt, max_tokens=max_tokens)
+                       for prompt, max_tokens in requests_list]
+            return [future.result() for future in futures]
+
+    def get_commit_history(self, repo_path: str, since: str = None, numstat: bool = False):
+        """Get repository commit history, oldest first, as CommitRecord objects."""
+        try:
+            return list(iter_commits(repo_path, since=since, numstat=numstat))
         except Exception as e:
             logging.error(f"Error getting commit history: {e}")
             return []
 
     
+    def build_timeline_figure(self, commits):
+        """Build the Gantt-style commit timeline figure."""
+        import plotly.figure_factory as ff
+
+        columns = CommitColumns.from_commits(commits)
+        df = []
+        for index, commit_date in enumerate(columns.timestamps.astype(datetime)):
+            message = columns.message(index)
+            df.append(dict(
+                Task="Development",
+                Start=commit_date,
+                Finish=commit_date,
+                Description=message[:30] + '...' if len(message) > 30 else message
+            ))
+
+        fig = ff.create_gantt(df, 
+                            index_col='Description',
+                            show_colorbar=True,
+                            group_tasks=True,
+                            showgrid_x=True,
+                            showgrid_y=True)
+        
+        fig.update_xaxes(
+            tickformat="%Y-%m-%d %H:%M:%S",
+            tickmode='auto',
+            nticks=20
+        )
+        return fig
+
     def generate_timeline_chart(self, commits, repo_name, type='image',assets_read_folder=None,assets_save_folder=None):
         """Generate a timeline visualization of commits."""
         try:
-            df = []
-            for commit in commits:
-                commit_date = datetime.strptime(commit['date'][:19], '%Y-%m-%d %H:%M:%S')
-                df.append(dict(
-                    Task="Development",
-                    Start=commit_date,
-                    Finish=commit_date,
-                    Description=commit['message'][:30] + '...' if len(commit['message']) > 30 else commit['message']
-                ))
-
-            fig = ff.create_gantt(df, 
-                                index_col='Description',
-                                show_colorbar=True,
-                                group_tasks=True,
-                                showgrid_x=True,
-                                showgrid_y=True)
-            
-            fig.update_xaxes(
-                tickformat="%Y-%m-%d %H:%M:%S",
-                tickmode='auto',
-                nticks=20
-            )
+            fig = self.build_timeline_figure(commits)
 
             if type=='html':
+                import plotly.io as pio
+
                 return pio.to_html(fig, full_html=False)
             else:
                 # Define assets directory
@@ -364,7 +438,7 @@ class EnhancedBlogGenerator:
 
                 # Save the image
                 try:
-                    pio.write_image(fig, output_path)
+                    export_figure(fig, output_path)
                     logging.info(f"Timeline chart saved as {output_path}")
                     
                     # Verify file was created
@@ -380,9 +454,9 @@ class EnhancedBlogGenerator:
         except Exception as e:
             logging.error(f"Error generating timeline: {e}")
             return ""
-    def generate_title(self, repo_name: str, repo_description: str, readme_content: str) -> str:
-        """Generate an engaging blog title."""
-        prompt = f"""
+    def build_title_prompt(self, repo_name: str, repo_description: str, readme_content: str) -> str:
+        """Build the prompt used by generate_title."""
+        return f"""
 Generate an engaging, creative blog title for a developer side project.
 Project details:
 - Name: {repo_name}
@@ -402,21 +476,107 @@ Requirements:
 
 Return ONLY the title, nothing else.
 """
-        return self._call_api(prompt, max_tokens=50)
 
-    def generate_blog_post(self, repo_name: str, repo_description: str, readme_content: str, repo_path: str,assets_save_folder:str,assets_read_folder:str) -> str:
-        """Generate complete blog post with timeline."""
-        print('input to generate',repo_name,repo_description,len(readme_content))
-        title = self.generate_title(repo_name, repo_description, readme_content)
-        if title.endswith('"'):
-            title = title.rstrip('"')
-        if title.startswith('"'):
-            title = title.lstrip('"')
+    def generate_plotly_charts(self, commits, repo_name, assets_save_folder, assets_read_folder) -> dict:
+        """Build the activity, code frequency and timeline figures and export them in one kaleido batch."""
+        builders = {
+            'activity': (self.build_commit_activity_figure, 'commit_activity'),
+            'frequency': (self.build_code_frequency_figure, 'code_frequency'),
+            'timeline': (self.build_timeline_figure, 'timeline_chart'),
+        }
+        os.makedirs(assets_save_folder, exist_ok=True)
+        paths = {kind: "" for kind in builders}
+        figures, outputs, kinds = [], [], []
+        for kind, (build, suffix) in builders.items():
+            try:
+                figures.append(build(commits))
+            except Exception as e:
+                logging.error(f"Error building {kind} chart: {e}")
+                continue
+            outputs.append(os.path.join(assets_save_folder, f"{repo_name}-{suffix}.png"))
+            kinds.append(kind)
+        for kind, output, ok in zip(kinds, outputs, export_figures(figures, outputs)):
+            if ok:
+                paths[kind] = os.path.join(assets_read_folder, os.path.basename(output))
+        return paths
+
+    def render_charts(self, commits, repo_name: str, assets_save_folder: str, assets_read_folder: str, jobs=None) -> dict:
+        """Render chart jobs in this process; used when no chart pool is configured."""
+        if self.chart_backend == "svg":
+            kinds = [kind for job in (jobs or CHART_JOBS) for kind in CHART_JOBS[job][1]]
+            return write_svg_charts(commits, repo_name, assets_save_folder, assets_read_folder, kinds=kinds,
+                                    max_authors=NETWORK_MAX_AUTHORS, max_edges=NETWORK_MAX_EDGES)
+        paths = {}
+        with _CHART_LOCK:
+            for job in (jobs or CHART_JOBS):
+                method_name, kinds = CHART_JOBS[job]
+                result = getattr(self, method_name)(commits, repo_name, assets_save_folder, assets_read_folder)
+                paths.update(result if isinstance(result, dict) else {kinds[0]: result})
+        return paths
+
+    def start_charts(self, commits, repo_name: str, assets_save_folder: str, assets_read_folder: str) -> dict:
+        """Look up cached charts and queue the rest on the chart pool, if there is one."""
+        state = {'args': (commits, repo_name, assets_save_folder, assets_read_folder),
+                 'cache': get_chart_cache(assets_save_folder), 'paths': {}, 'jobs': list(CHART_JOBS)}
+        if state['cache'] is not None:
+            state['fingerprint'] = commits_fingerprint(commits, backend=self.chart_backend)
+            state['jobs'] = []
+            for job, (_, kinds) in CHART_JOBS.items():
+                cached = state['cache'].lookup(repo_name, job, state['fingerprint'], kinds)
+                if cached is None:
+                    state['jobs'].append(job)
+                else:
+                    state['paths'].update(cached)
+        state['futures'] = None
+        # SVG charts take milliseconds, so they never go through the pool
+        if self.chart_renderer is not None and state['jobs'] and self.chart_backend != "svg":
+            state['futures'] = self.chart_renderer.submit(*state['args'], jobs=state['jobs'])
+        return state
+
+    def finish_charts(self, state: dict) -> dict:
+        """Wait for (or render) the charts queued by start_charts and record them in the cache."""
+        paths = dict(state['paths'])
+        if not state['jobs']:
+            return paths
+        if state['futures'] is not None:
+            rendered = self.chart_renderer.collect(state['futures'])
+        else:
+            rendered = self.render_charts(*state['args'], jobs=state['jobs'])
+        paths.update(rendered)
+        if state['cache'] is not None:
+            repo_name = state['args'][1]
+            for job in state['jobs']:
+                kinds = CHART_JOBS[job][1]
+                if all(rendered.get(kind) for kind in kinds):
+                    state['cache'].store(repo_name, job, state['fingerprint'],
+                                         {kind: rendered[kind] for kind in kinds})
+        return paths
 
+    def generate_title(self, repo_name: str, repo_description: str, readme_content: str) -> str:
+        """Generate an engaging blog title."""
+        prompt = self.build_title_prompt(repo_name, repo_description, readme_content)
+        return self._call_api(prompt, max_tokens=50)
 
-        
-        print('generate_blog_post-generate_title',repo_name,title)
-        commits = self.get_commit_history(repo_path)
+    def generate_blog_post(self, repo_name: str, repo_description: str, readme_content: str, repo_path: str,assets_save_folder:str,assets_read_folder:str, commits: list = None) -> str:
+        """Generate complete blog post with timeline.
+
+        ``commits`` (get_commit_history format) skips the local git log, e.g. when
+        the GraphQL listing already brought the repo's history.
+        """
+        print('input to generate',repo_name,repo_description,len(readme_content))
+        if commits is None:
+            commits = self.get_commit_history(repo_path)
+        # Parse commits once and share the columns with every chart
+        commits = CommitColumns.from_commits(commits)
+        # Pooled charts render while the text is being generated
+        charts = self.start_charts(commits, repo_name, assets_save_folder, assets_read_folder)
+        # Condense the README once; the long prompts all start with the same
+        # context block and only differ in their instructions
+        context = ReadmeContext(readme_content, max_tokens=self.readme_tokens)
+        shared_context = f"""Project: {repo_name}
+README (condensed):
+{context.text}
+"""
         
         sections = {
             'introduction': {
@@ -424,7 +584,7 @@ Return ONLY the title, nothing else.
                 'prompt': f"""
 Write an engaging introduction for a blog post about {repo_name}.
 Context:
-{readme_content[:500]}...
+{context.excerpt}
 
 Include:
 1. The spark/inspiration for the project
@@ -437,11 +597,8 @@ Write in first person, make it personal and engaging.
             },
             'research': {
                 'title': '## From Idea to Implementation',
-                'prompt': f"""
-Based on the repository README:
-{readme_content}
-
-Write about:
+                'prompt': f"""{shared_context}
+Based on the repository README above, write about:
 1. Initial research and planning
 2. Technical decisions and their rationale
 3. Alternative approaches considered
@@ -452,11 +609,8 @@ Focus on the journey from concept to code.
             },
             'technical': {
                 'title': '## Under the Hood',
-                'prompt': f"""
-Analyze this README content:
-{readme_content}
-
-Create a technical deep-dive covering:
+                'prompt': f"""{shared_context}
+Analyze the README content above and create a technical deep-dive covering:
 1. Architecture decisions
 2. Key technologies used
 3. Interesting implementation details
@@ -467,11 +621,8 @@ Include specific examples and code concepts,wrap code with ```...code...```.
             },
             'lessons': {
                 'title': '## Lessons from the Trenches',
-                'prompt': f"""
-Based on the project history and README:
-{readme_content}
-
-Share:
+                'prompt': f"""{shared_context}
+Based on the project history and the README above, share:
 1. Key technical lessons learned
 2. What worked well
 3. What you'd do differently
@@ -482,25 +633,36 @@ Be specific and practical.
             }
         }
 
-        blog_content =''
-
-
-
-        for section_name, section_data in sections.items():
-            content = self._call_api(section_data['prompt'], max_tokens=1024)
-            blog_content += f"{section_data['title']}\n\n{content}\n\n"
-
-        conclusion_prompt = f"""
-Write a forward-looking conclusion for {repo_name} that includes:
+        conclusion_prompt = f"""{shared_context}
+Based on the README above, write a forward-looking conclusion for {repo_name} that includes:
 1. Current project status
 2. Future development plans
 3. Call to action for contributors
 4. Final thoughts on the side project journey
-
-Base it on this README:
-{readme_content}
 """
-        conclusion = self._call_api(conclusion_prompt, max_tokens=300)
+
+        # Title, sections and conclusion don't depend on each other, so send them together
+        title_prompt = self.build_title_prompt(repo_name, repo_description, context.excerpt)
+        responses = self._call_api_batch(
+            [(title_prompt, 50)]
+            + [(section_data['prompt'], 1024) for section_data in sections.values()]
+            + [(conclusion_prompt, 300)]
+        )
+        title = responses[0]
+        section_contents = responses[1:-1]
+        conclusion = responses[-1]
+
+        if title.endswith('"'):
+            title = title.rstrip('"')
+        if title.startswith('"'):
+            title = title.lstrip('"')
+        print('generate_blog_post-generate_title',repo_name,title)
+        print(f"{repo_name}: {self.usage['calls']} prompts sent, ~{self.usage['prompt_tokens']} prompt tokens "
+              f"(README {context.source_tokens} -> {context.tokens} tokens)")
+
+        blog_content =''
+        for section_data, content in zip(sections.values(), section_contents):
+            blog_content += f"{section_data['title']}\n\n{content}\n\n"
         blog_content += f"## What's Next?\n\n{conclusion}\n"
         minutes, seconds = self.calculate_reading_time(blog_content)
         reading_time = self.format_reading_time(minutes, seconds)
@@ -511,11 +673,12 @@ Base it on this README:
 {reading_time}  read
 """+blog_content
         # Generate all visualizations
-        heatmap_path = self.generate_commit_heatmap(commits, repo_name, assets_save_folder, assets_read_folder)
-        network_path = self.generate_contribution_network(commits, repo_name, assets_save_folder, assets_read_folder)
-        activity_path = self.generate_commit_activity_chart(commits, repo_name, assets_save_folder, assets_read_folder)
-        frequency_path = self.generate_code_frequency_chart(commits, repo_name, assets_save_folder, assets_read_folder)
-        timeline_path = self.generate_timeline_chart(commits,repo_name,type='image',assets_save_folder=assets_save_folder,assets_read_folder=assets_read_folder)
+        chart_paths = self.finish_charts(charts)
+        heatmap_path = chart_paths['heatmap']
+        network_path = chart_paths['network']
+        activity_path = chart_paths['activity']
+        frequency_path = chart_paths['frequency']
+        timeline_path = chart_paths['timeline']
         
         # Start building the blog content
         blog_content += f"""## Project Development Analytics
@@ -1,5 +1,5 @@
-import requests
 import json
+from httpclient import get_http_client
 from typing import List, Dict, Union
 
 class EnhancedBlogGenerator:
@@ -32,7 +32,7 @@ class EnhancedBlogGenerator:
             "max_tokens": max_tokens,
         }
         
-        response = requests.post(self.api_url, headers=headers, json=data)
+        response = get_http_client().post(self.api_url, headers=headers, json=data, idempotent=True)
         
         if response.status_code == 200:
             response_json = response.json()
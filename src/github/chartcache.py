@@ -0,0 +1,136 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+
+# Bump when chart code changes in a way that should redraw every image
+CHART_CACHE_VERSION = 3
+MANIFEST_NAME = "charts-manifest.json"
+
+
+def commits_fingerprint(columns, **params) -> str:
+    """Hash a CommitColumns store plus any chart parameters that affect output."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps(
+        {"version": CHART_CACHE_VERSION, **params}, sort_keys=True, default=str
+    ).encode("utf-8"))
+    for array in (columns.timestamps, columns.author_codes, columns.message_offsets,
+                  columns.additions, columns.deletions):
+        digest.update(array.tobytes())
+    digest.update("\0".join(columns.authors).encode("utf-8"))
+    digest.update(columns.messages.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ChartCache:
+    """Manifest of rendered chart images in ``assets_save_folder``.
+
+    Each entry is keyed by ``repo/job`` and remembers the commit fingerprint
+    it was drawn from and the files it wrote.  A job whose fingerprint still
+    matches and whose files are on disk is not rendered again, and entries for
+    repos that no longer have a post can be garbage-collected.
+    """
+
+    def __init__(self, assets_save_folder: str):
+        self.assets_save_folder = assets_save_folder
+        self.path = os.path.join(assets_save_folder, MANIFEST_NAME)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as file:
+                    self.entries = json.load(file).get("charts", {})
+            except (ValueError, OSError) as e:
+                logging.warning(f"Ignoring unreadable chart manifest {self.path}: {e}")
+
+    def lookup(self, repo_name: str, job: str, fingerprint: str, kinds) -> dict:
+        """Return ``{kind: read path}`` when the job's images are current, else None."""
+        with self._lock:
+            entry = self.entries.get(f"{repo_name}/{job}")
+        if (
+            entry is None
+            or entry.get("fingerprint") != fingerprint
+            or any(not entry["paths"].get(kind) for kind in kinds)
+            or any(
+                not os.path.exists(os.path.join(self.assets_save_folder, name))
+                for name in entry["files"]
+            )
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dict(entry["paths"])
+
+    def store(self, repo_name: str, job: str, fingerprint: str, paths: dict):
+        files = sorted(os.path.basename(path) for path in paths.values() if path)
+        with self._lock:
+            self.entries[f"{repo_name}/{job}"] = {
+                "repo": repo_name,
+                "fingerprint": fingerprint,
+                "paths": paths,
+                "files": files,
+            }
+            self._dirty = True
+
+    def collect_garbage(self, keep_repos) -> list:
+        """Delete images of repos not in ``keep_repos`` and drop their entries."""
+        keep_repos = set(keep_repos)
+        removed = []
+        with self._lock:
+            for key in sorted(self.entries):
+                entry = self.entries[key]
+                if entry["repo"] in keep_repos:
+                    continue
+                for name in entry["files"]:
+                    path = os.path.join(self.assets_save_folder, name)
+                    if os.path.exists(path):
+                        os.remove(path)
+                        removed.append(path)
+                del self.entries[key]
+                self._dirty = True
+        return removed
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.assets_save_folder, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.assets_save_folder, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"charts": self.entries}, file, ensure_ascii=False,
+                          indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+_enabled = True
+
+
+def configure_chart_cache(enabled: bool = True):
+    global _enabled
+    _enabled = enabled
+
+
+def get_chart_cache(assets_save_folder: str):
+    """Shared ChartCache for a folder, or None when the chart cache is off."""
+    if not _enabled or not assets_save_folder:
+        return None
+    key = os.path.abspath(assets_save_folder)
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = ChartCache(key)
+        return _caches[key]
+
+
+def save_chart_caches():
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.save()
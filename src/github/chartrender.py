@@ -0,0 +1,108 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Pool job -> (EnhancedBlogGenerator method, chart kinds it produces).
+# The three Plotly charts share one job so they go to kaleido as one batch.
+CHART_JOBS = {
+    "heatmap": ("generate_commit_heatmap", ("heatmap",)),
+    "network": ("generate_contribution_network", ("network",)),
+    "plotly": ("generate_plotly_charts", ("activity", "frequency", "timeline")),
+}
+
+_worker_generator = None
+
+
+def render_chart(job: str, commits, repo_name: str, assets_save_folder: str,
+                 assets_read_folder: str) -> dict:
+    """Run one chart job inside a pool process; returns ``{kind: read path}``."""
+    global _worker_generator
+    from bloghelper import EnhancedBlogGenerator
+
+    if _worker_generator is None:
+        _worker_generator = EnhancedBlogGenerator(
+            current_date="", username="", api_url="", api_key="",
+            cache=False, chart_renderer=False,
+        )
+    method_name, kinds = CHART_JOBS[job]
+    result = getattr(_worker_generator, method_name)(
+        commits, repo_name, assets_save_folder, assets_read_folder
+    )
+    if isinstance(result, dict):
+        return result
+    return {kinds[0]: result}
+
+
+class ChartRenderer:
+    """Render analytics charts in a process pool.
+
+    matplotlib and kaleido are CPU-bound and keep global state, so chart jobs
+    run in worker processes; each worker keeps one kaleido export server for
+    its whole life.  Jobs from many posts share the pool, and a job that fails
+    or crashes its worker only blanks its own charts.
+    """
+
+    def __init__(self, processes: int = None):
+        # spawn: forking a process that already runs pipeline threads can deadlock
+        self.executor = ProcessPoolExecutor(
+            max_workers=processes or None,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def submit(self, commits, repo_name: str, assets_save_folder: str,
+               assets_read_folder: str, jobs=None) -> dict:
+        """Queue every chart job for one repo; returns ``{job: future}``."""
+        return {
+            job: self.executor.submit(render_chart, job, commits, repo_name,
+                                      assets_save_folder, assets_read_folder)
+            for job in (jobs or CHART_JOBS)
+        }
+
+    @staticmethod
+    def collect(futures: dict) -> dict:
+        """Wait for submitted jobs; charts of failed jobs come back as ''."""
+        paths = {}
+        for job, future in futures.items():
+            kinds = CHART_JOBS[job][1]
+            try:
+                result = future.result()
+            except Exception as e:
+                logging.error(f"Error rendering {job} charts: {e}")
+                result = {}
+            for kind in kinds:
+                paths[kind] = result.get(kind) or ""
+        return paths
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+
+_default_renderer = None
+_default_processes = 0
+_default_lock = threading.Lock()
+
+
+def configure_chart_renderer(processes: int = 0):
+    """0 renders in-process; N > 0 uses a pool of N processes (None = one per core)."""
+    global _default_processes
+    _default_processes = processes
+
+
+def get_chart_renderer():
+    """Return the shared ChartRenderer, or None when charts render in-process."""
+    global _default_renderer
+    if _default_processes == 0:
+        return None
+    with _default_lock:
+        if _default_renderer is None:
+            _default_renderer = ChartRenderer(_default_processes)
+        return _default_renderer
+
+
+def shutdown_chart_renderer():
+    global _default_renderer
+    with _default_lock:
+        if _default_renderer is not None:
+            _default_renderer.shutdown()
+            _default_renderer = None
@@ -0,0 +1,241 @@
+import subprocess
+
+import numpy as np
+
+# Record / field separators that can't appear in a one-line subject
+RECORD_MARK = "\x1e"
+FIELD_SEP = "\x1f"
+LOG_FORMAT = "%x1e%H%x1f%an%x1f%ai%x1f%s"
+
+
+class CommitRecord:
+    """One commit from ``git log``; also readable as ``commit['date']`` like the old dicts."""
+
+    __slots__ = ("hash", "author", "date", "message", "additions", "deletions")
+
+    def __init__(self, hash: str, author: str, date: str, message: str,
+                 additions: int = 0, deletions: int = 0):
+        self.hash = hash
+        self.author = author
+        self.date = date
+        self.message = message
+        self.additions = additions
+        self.deletions = deletions
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"CommitRecord({self.hash[:10]} {self.date} {self.author!r})"
+
+
+def _parse_header(header: str):
+    commit_hash, author, date, message = header.lstrip(RECORD_MARK).split(FIELD_SEP, 3)
+    return CommitRecord(commit_hash, author, date, message)
+
+
+def _add_numstat(record: CommitRecord, line: str):
+    parts = line.split("\t", 2)
+    if len(parts) < 3:
+        # Bare path tokens that follow a rename entry
+        return
+    added, deleted = parts[0], parts[1]
+    # Binary files report "-"
+    if added.isdigit():
+        record.additions += int(added)
+    if deleted.isdigit():
+        record.deletions += int(deleted)
+
+
+def iter_commits(repo_path: str, since: str = None, numstat: bool = False,
+                 reverse: bool = True, max_count: int = None,
+                 chunk_size: int = 1 << 16):
+    """Stream commits from ``git log -z`` without buffering the whole history.
+
+    Output is read in ``chunk_size`` pieces and split on NUL, so memory stays
+    flat no matter how long the history is.  ``since`` is passed to
+    ``--since`` (e.g. ``"1 year ago"``) and ``numstat`` fills in the
+    additions/deletions totals.
+    """
+    cmd = ["git", "-C", repo_path, "log", "-z", f"--pretty=format:{LOG_FORMAT}"]
+    if reverse:
+        cmd.append("--reverse")
+    if since:
+        cmd.append(f"--since={since}")
+    if max_count:
+        cmd.append(f"--max-count={int(max_count)}")
+    if numstat:
+        cmd.append("--numstat")
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    current = None
+    pending = b""
+    finished = False
+    try:
+        while True:
+            chunk = process.stdout.read(chunk_size)
+            if chunk:
+                pending += chunk
+                tokens = pending.split(b"\0")
+                pending = tokens.pop()
+            else:
+                tokens = [pending] if pending else []
+            for raw in tokens:
+                token = raw.decode("utf-8", errors="replace")
+                if not token:
+                    continue
+                if token.startswith(RECORD_MARK) or token.startswith("\n" + RECORD_MARK):
+                    if current is not None:
+                        yield current
+                    # With --numstat the first stat line shares the header's token
+                    header, _, stat_line = token.lstrip("\n").partition("\n")
+                    current = _parse_header(header)
+                    if stat_line:
+                        _add_numstat(current, stat_line)
+                elif current is not None and numstat:
+                    _add_numstat(current, token.strip("\n"))
+            if not chunk:
+                break
+        if current is not None:
+            yield current
+        finished = True
+    finally:
+        process.stdout.close()
+        stderr = process.stderr.read().decode("utf-8", errors="replace")
+        process.stderr.close()
+        # A consumer that stops early makes git exit on SIGPIPE; only report real failures
+        if process.wait() != 0 and finished:
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr)
+
+
+class CommitColumns:
+    """Commits parsed once into NumPy columns for the analytics charts.
+
+    ``timestamps`` hold the committer's wall-clock time as ``datetime64[s]``
+    (the same value the charts used to get from ``date[:19]``), authors are
+    stored as integer codes into ``authors``, and messages are concatenated
+    into one string addressed by ``message_offsets``.
+    """
+
+    def __init__(self, timestamps, author_codes, authors, messages,
+                 message_offsets, additions, deletions):
+        self.timestamps = timestamps
+        self.author_codes = author_codes
+        self.authors = authors
+        self.messages = messages
+        self.message_offsets = message_offsets
+        self.additions = additions
+        self.deletions = deletions
+
+    @classmethod
+    def from_commits(cls, commits):
+        if isinstance(commits, cls):
+            return commits
+        count = len(commits)
+        stamps = []
+        author_index = {}
+        author_codes = np.empty(count, dtype=np.int32)
+        message_offsets = np.zeros(count + 1, dtype=np.int64)
+        additions = np.zeros(count, dtype=np.int64)
+        deletions = np.zeros(count, dtype=np.int64)
+        message_parts = []
+        position = 0
+        for i, commit in enumerate(commits):
+            date = commit["date"]
+            stamps.append(date[:10] + "T" + date[11:19])
+            author_codes[i] = author_index.setdefault(commit["author"], len(author_index))
+            message = commit["message"]
+            message_parts.append(message)
+            position += len(message)
+            message_offsets[i + 1] = position
+            additions[i] = commit.get("additions", 0) or 0
+            deletions[i] = commit.get("deletions", 0) or 0
+        return cls(
+            timestamps=np.array(stamps, dtype="datetime64[s]"),
+            author_codes=author_codes,
+            authors=list(author_index),
+            messages="".join(message_parts),
+            message_offsets=message_offsets,
+            additions=additions,
+            deletions=deletions,
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def message(self, index: int) -> str:
+        return self.messages[self.message_offsets[index]:self.message_offsets[index + 1]]
+
+    def author(self, index: int) -> str:
+        return self.authors[self.author_codes[index]]
+
+    @property
+    def days(self):
+        """Calendar day of every commit as ``datetime64[D]``."""
+        return self.timestamps.astype("datetime64[D]")
+
+    @property
+    def weekdays(self):
+        """Monday=0 .. Sunday=6, matching ``datetime.weekday()``."""
+        # 1970-01-01 was a Thursday
+        return (self.days.astype(np.int64) + 3) % 7
+
+    @property
+    def hours(self):
+        return (self.timestamps - self.days).astype("timedelta64[h]").astype(np.int64)
+
+    def calendar_grid(self, start=None, end=None):
+        """Commits per day laid out as a ``7 x weeks`` grid (Monday row first).
+
+        ``start``/``end`` are anything ``numpy.datetime64`` accepts and default
+        to the year ending on the last commit; pass the first commit day as
+        ``start`` for a multi-year grid.  Columns are whole weeks starting on
+        Monday, so weeks never collide across a year boundary the way ISO week
+        numbers do.  Returns ``(grid, week_starts)``; days outside
+        ``[start, end]`` are 0.
+        """
+        days = self.days
+        end = np.datetime64(end, "D") if end is not None else days.max()
+        start = np.datetime64(start, "D") if start is not None else end - np.timedelta64(365, "D")
+        # Back up to the Monday of the first week
+        first_monday = start - np.timedelta64((start.astype(np.int64) + 3) % 7, "D")
+        week_count = int((end - first_monday).astype(np.int64)) // 7 + 1
+
+        offsets = (days - first_monday).astype(np.int64)
+        in_range = (days >= start) & (days <= end)
+        counts = np.bincount(offsets[in_range], minlength=week_count * 7)
+        grid = counts[:week_count * 7].reshape(week_count, 7).T
+        week_starts = first_monday + np.arange(week_count) * np.timedelta64(7, "D")
+        return grid, week_starts
+
+    def contributor_graph(self, max_authors: int = None, max_edges: int = None):
+        """Author hand-off graph: an edge joins the authors of consecutive commits.
+
+        Only the ``max_authors`` most active authors and the ``max_edges``
+        heaviest edges between them are kept.  Returns ``(commit_counts,
+        top_authors, edges, weights)`` where ``commit_counts`` is indexed by
+        author code, ``top_authors`` holds codes by descending commit count and
+        ``edges`` is an ``(n, 2)`` array of code pairs by descending weight.
+        """
+        commit_counts = np.bincount(self.author_codes, minlength=len(self.authors))
+        top_authors = np.argsort(-commit_counts, kind="stable")[:max_authors]
+        kept = np.zeros(len(self.authors), dtype=bool)
+        kept[top_authors] = True
+
+        first, second = self.author_codes[:-1], self.author_codes[1:]
+        changed = (first != second) & kept[first] & kept[second]
+        pairs = np.sort(np.stack([first[changed], second[changed]], axis=1), axis=1)
+        if not len(pairs):
+            return commit_counts, top_authors, np.empty((0, 2), dtype=np.int32), np.empty(0, dtype=np.int64)
+        edges, weights = np.unique(pairs, axis=0, return_counts=True)
+        heaviest = np.argsort(-weights, kind="stable")[:max_edges]
+        return commit_counts, top_authors, edges[heaviest], weights[heaviest]
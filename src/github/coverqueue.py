@@ -0,0 +1,91 @@
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+
+
+FRONTMATTER_RE = re.compile(r"\A---\n(.*?\n)---(?=\n|\Z)(.*)\Z", re.DOTALL)
+
+
+def split_frontmatter(text: str):
+    """``(frontmatter dict, body)`` of a ``---`` delimited markdown post."""
+    match = FRONTMATTER_RE.match(text)
+    if match is None:
+        raise ValueError("post has no frontmatter")
+    return yaml.safe_load(match.group(1)) or {}, match.group(2)
+
+
+def write_post(md_path: str, frontmatter: dict, body: str):
+    """Write a post atomically; ``body`` is everything after the closing ``---``."""
+    folder = os.path.dirname(os.path.abspath(md_path))
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as file:
+        file.write(f"---\n{yaml.dump(frontmatter, default_flow_style=False)}---{body}")
+    # mkstemp creates 0600; posts are read by the site build
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, md_path)
+
+
+def patch_cover(md_path: str, image_url: str, square_url: str = None) -> bool:
+    """Point the post's ``cover`` at ``image_url``; rewrites the file atomically."""
+    with open(md_path, "r", encoding="utf-8") as file:
+        frontmatter, body = split_frontmatter(file.read())
+    cover = frontmatter.get("cover") or {}
+    square_url = square_url or image_url
+    if cover.get("url") == image_url and cover.get("square") == square_url:
+        return False
+    cover.update(url=image_url, square=square_url)
+    frontmatter["cover"] = cover
+    write_post(md_path, frontmatter, body)
+    return True
+
+
+class CoverImageQueue:
+    """Generate cover images in the background while posts are written.
+
+    ``submit`` starts a job as soon as the prompt is known; the post is
+    written with a placeholder cover and registered with ``attach``.
+    ``finish`` waits for the remaining jobs and patches the real image into
+    every attached post whose job produced one.
+    """
+
+    def __init__(self, generate, workers: int = 2):
+        # prompt -> image URL, or None when no image could be made
+        self.generate = generate
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                           thread_name_prefix="cover-image")
+        self.jobs = {}
+        self.posts = {}
+
+    def submit(self, name: str, prompt: str):
+        self.jobs[name] = self.executor.submit(self.generate, prompt)
+
+    def attach(self, name: str, md_path: str):
+        self.posts[name] = md_path
+
+    def finish(self) -> dict:
+        """Wait for all jobs and patch covers; returns ``{name: image URL}``."""
+        images = {}
+        try:
+            for name, job in self.jobs.items():
+                try:
+                    image_url = job.result()
+                except Exception as e:
+                    logging.error(f"Cover image for {name} failed: {e}")
+                    continue
+                if not image_url:
+                    continue
+                images[name] = image_url
+                md_path = self.posts.get(name)
+                if md_path and os.path.exists(md_path):
+                    try:
+                        if patch_cover(md_path, image_url):
+                            print(f"Cover image patched into {md_path}")
+                    except (OSError, ValueError, yaml.YAMLError) as e:
+                        logging.error(f"Could not patch cover of {md_path}: {e}")
+        finally:
+            self.executor.shutdown(wait=True)
+        return images
@@ -1,14 +1,33 @@
 import traceback
-import requests
 import json
 import os
 import datetime
+import functools
+import hashlib
 import random
+import time
 import yaml
 from dotenv import load_dotenv
 import asyncio
-from bloghelper import EnhancedBlogGenerator
-from default_image_requests import preparedefaultimage
+from pipelinehelper import RepoPipeline
+from llmcache import configure_default_cache, get_default_cache
+from chartrender import configure_chart_renderer, shutdown_chart_renderer
+from chartcache import configure_chart_cache, get_chart_cache, save_chart_caches
+from repostate import RepoStateLedger, compute_inputs_hash
+from httpcache import ConditionalHTTPCache
+from httpclient import configure_http_client, get_http_client
+from endpointpool import EndpointPool
+from tagindex import TagIndex
+from coverqueue import CoverImageQueue, split_frontmatter, write_post
+from assetoptimize import AssetOptimizer
+from assetstore import store_download
+from githubapi import (
+    GRAPHQL_URL,
+    RAW_MEDIA_TYPE,
+    fetch_readmes_batch,
+    fetch_repositories_graphql,
+    git_blob_sha,
+)
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(current_dir, "../../"))
 
@@ -16,7 +35,6 @@ project_root = os.path.abspath(os.path.join(current_dir, "../../"))
 
 # Load environment variables from .env file
 load_dotenv()
-print("Script started")
 
 # Load config file for default author, folder, and OpenAI model
 CONFIG_FILE = "config.yml"
@@ -46,12 +64,59 @@ api_url = config.get(
     "https://heisenberg-duckduckgo-66.deno.dev/v1/chat/completions",
 )
 api_model = config.get("api_model", "gpt-4o-mini")
+# "json": keywords and tags from one structured call, "separate": two calls
+KEYWORD_EXTRACTION = config.get("keyword_extraction", "json")
+
+# Equivalent chat proxies; each call goes to the healthiest one (latency and
+# error EWMA), failing ones are skipped for a while, and hedge_after_seconds
+# races a slow call against the next best endpoint
+LLM_ENDPOINTS_CONFIG = config.get("llm_endpoints") or {}
+LLM_ENDPOINTS = EndpointPool(
+    LLM_ENDPOINTS_CONFIG.get("urls") or [api_url],
+    failure_threshold=LLM_ENDPOINTS_CONFIG.get("failure_threshold", 3),
+    cooldown=LLM_ENDPOINTS_CONFIG.get("cooldown_seconds", 60),
+    hedge_after=LLM_ENDPOINTS_CONFIG.get("hedge_after_seconds"),
+)
 
 api_key = os.getenv("OPENAI_API_KEY", "your_self_openai_api_access_token_here")
 
 TAGS_SERVER_DIR_STORAG = config.get("tag_file_path", "")
 TAGS_SERVER_DIR_STORAG = os.path.join(project_root, TAGS_SERVER_DIR_STORAG)
 
+# Analytics charts render in this many worker processes, 0 = in-process
+CHARTS_CONFIG = config.get("charts") or {}
+# "svg" writes vector charts directly and needs no worker processes
+CHART_BACKEND = CHARTS_CONFIG.get("backend", "png")
+configure_chart_renderer(CHARTS_CONFIG.get("processes", 4) if CHART_BACKEND != "svg" else 0)
+# Skip redrawing charts whose commit data didn't change
+configure_chart_cache(CHARTS_CONFIG.get("cache", True))
+
+# Timeouts and retry policy of the HTTP client every request goes through
+HTTP_CONFIG = config.get("http") or {}
+configure_http_client(
+    timeout=(
+        HTTP_CONFIG.get("connect_timeout", 10),
+        HTTP_CONFIG.get("read_timeout", 120),
+    ),
+    retries=HTTP_CONFIG.get("retries", 3),
+    backoff=HTTP_CONFIG.get("backoff", 1.0),
+    max_backoff=HTTP_CONFIG.get("max_backoff", 60),
+)
+
+# Keep-alive client for GitHub; GETs also go through get_http_cache(),
+# where a 304 doesn't use rate limit
+GITHUB_SESSION = get_http_client()
+# "graphql" lists repos with README and commits in a few queries, "rest" is the old path
+GITHUB_SOURCE = config.get("github_source", "graphql")
+GITHUB_GRAPHQL_URL = config.get("github_graphql_url") or GRAPHQL_URL
+HTTP_CACHE_CONFIG = config.get("http_cache") or {}
+_http_cache = None
+
+# Ledger of pushed_at / README sha / inputs hash per generated post
+REPO_STATE_FILE = os.path.join(
+    project_root, config.get("state_file", "themes/database/repo_state.jsonl")
+)
+
 DEFAULT_AUTHOR_LIST = config.get("author_list", ["unknown"])
 OUTPUT_FOLDER = config.get("output_folder", "markdown_files")
 OUTPUT_FOLDER = os.path.join(project_root, OUTPUT_FOLDER)
@@ -63,15 +128,35 @@ BASE_URL = config.get(
     "base_url", "http://localhost:3000/"
 )  # Base URL for generated images
 IMAGE_API_URL = config.get("image_api_url", "image_api_url")
+# Downloaded images larger than this are rejected
+IMAGE_MAX_BYTES = int(config.get("image_max_mb", 10) * 1024 * 1024)
 FLUX_MODEL = config.get("flux_model", "DS-8-CF")
 
-print("yml config", config)
-# Ensure the output folder exists
-if not os.path.exists(OUTPUT_FOLDER):
-    os.makedirs(OUTPUT_FOLDER)
-
-if not os.path.exists(IMAGE_FOLDER):
-    os.makedirs(IMAGE_FOLDER)
+# Covers and charts get downscaled WebP variants that the posts point at
+ASSETS_CONFIG = config.get("assets") or {}
+ASSET_OPTIMIZE = ASSETS_CONFIG.get("optimize", True)
+_asset_optimizer = None
+
+PIPELINE_CONFIG = config.get("pipeline") or {}
+PIPELINE_WORKERS = PIPELINE_CONFIG.get("workers", 4)
+PIPELINE_STAGE_LIMITS = PIPELINE_CONFIG.get("stage_limits") or {}
+SECTION_WORKERS = PIPELINE_CONFIG.get("section_workers", 6)
+# README tokens embedded in the blog prompts, condensed once per post
+README_CONTEXT_TOKENS = (config.get("readme_context") or {}).get("max_tokens", 1500)
+# (repo, prompts sent, prompt tokens) of every generated post
+PROMPT_USAGE = []
+
+LLM_CACHE_CONFIG = config.get("llm_cache") or {}
+configure_default_cache(
+    enabled=LLM_CACHE_CONFIG.get("enabled", True),
+    path=(
+        os.path.join(project_root, LLM_CACHE_CONFIG["path"])
+        if LLM_CACHE_CONFIG.get("path")
+        else None
+    ),
+    ttl_seconds=LLM_CACHE_CONFIG.get("ttl_days", 30) * 24 * 3600,
+    max_bytes=LLM_CACHE_CONFIG.get("max_mb", 64) * 1024 * 1024,
+)
 
 # GitHub API Token
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "your_github_access_token_here")
@@ -79,17 +164,68 @@ SILICON_TOKEN = os.getenv(
     "SILICON_TOKEN", "your_SILICON_TOKEN_access_token_here"
 )
 
-print("your token", GITHUB_TOKEN)
 HEADERS = {"Authorization": f"token {GITHUB_TOKEN}"}
 
 # Image generation API URL and Token
 IMAGE_API_KEY = os.getenv("IMAGE_API_KEY", "your_image_api_key_here")
 
-print("your IMAGE_API_KEY", IMAGE_API_KEY)
-
 import re
 
-defaultimages = preparedefaultimage()
+# Importing this module has no side effects beyond reading .env and
+# config.yml: spawned chart workers re-import it, and a run with nothing to
+# post shouldn't pay for the plotting stack or the default image list.
+# Folders, caches and the default images are set up on first use.
+_default_images = None
+
+
+def get_default_images():
+    global _default_images
+    if _default_images is None:
+        from default_image_requests import preparedefaultimage
+
+        _default_images = preparedefaultimage()
+    return _default_images
+
+
+def get_http_cache():
+    # ETag/Last-Modified store for GitHub GETs, None when disabled
+    global _http_cache
+    if _http_cache is None and HTTP_CACHE_CONFIG.get("enabled", True):
+        _http_cache = ConditionalHTTPCache(
+            os.path.join(
+                project_root,
+                HTTP_CACHE_CONFIG.get("path", ".cache/http_cache.sqlite"),
+            ),
+            session=GITHUB_SESSION,
+            ttl_seconds=HTTP_CACHE_CONFIG.get("ttl_days", 30) * 24 * 3600,
+            max_entries=HTTP_CACHE_CONFIG.get("max_entries", 5000),
+        )
+    return _http_cache
+
+
+def get_asset_optimizer():
+    # Variant writer and manifest for assets_save_folder, None when disabled
+    global _asset_optimizer
+    if _asset_optimizer is None and ASSET_OPTIMIZE:
+        _asset_optimizer = AssetOptimizer(
+            assets_save_folder,
+            processes=ASSETS_CONFIG.get("processes", 2),
+            quality=ASSETS_CONFIG.get("webp_quality", 80),
+        )
+    return _asset_optimizer
+
+
+def prepare_run():
+    print("Script started")
+    print("yml config", config)
+    print("your token", GITHUB_TOKEN)
+    print("your IMAGE_API_KEY", IMAGE_API_KEY)
+    # Ensure the output folder exists
+    if not os.path.exists(OUTPUT_FOLDER):
+        os.makedirs(OUTPUT_FOLDER)
+
+    if not os.path.exists(IMAGE_FOLDER):
+        os.makedirs(IMAGE_FOLDER)
 
 
 def replace_non_word_characters(input_list):
@@ -114,49 +250,91 @@ def replace_non_word_characters(input_list):
 # result = replace_non_word_characters(input_list)
 
 
-# Fetch all repositories of a user
-def get_repositories(username):
+def github_get(url, **kwargs):
+    # Conditional GET through the http cache when it is enabled
+    http_cache = get_http_cache()
+    if http_cache is None:
+        return GITHUB_SESSION.get(url, **kwargs)
+    return http_cache.get(url, **kwargs)
+
+
+# Stream a user's repositories, most recently pushed first
+def get_repositories(username, days_threshold=None):
+    # With days_threshold, paging stops at the first repo outside the window,
+    # so busy accounts cost one page instead of dozens
     url = f"https://api.github.com/users/{username}/repos"
-    repos = []
-    params = {"per_page": 100, "page": 1}
+    params = {"per_page": 100, "page": 1, "sort": "pushed", "direction": "desc"}
 
     while True:
-        response = requests.get(url, headers=HEADERS, params=params)
+        response = github_get(url, headers=HEADERS, params=dict(params))
         if response.status_code != 200:
             print(
                 f"Failed to fetch repos: {response.json().get('message', 'Unknown error')}"
             )
-            break
+            return
 
         data = response.json()
         if not data:
-            break
+            return
 
-        repos.extend(data)
+        for repo in data:
+            if days_threshold is not None and not is_recently_updated(
+                repo, days_threshold
+            ):
+                return
+            yield repo
         params["page"] += 1
 
-    return repos
-
 
-# Fetch README content
-def get_readme_content(owner, repo):
+# Fetch README content together with its blob sha in one round trip
+def get_readme(owner, repo):
     url = f"https://api.github.com/repos/{owner}/{repo}/readme"
-    response = requests.get(url, headers=HEADERS)
+    response = github_get(url, headers={**HEADERS, "Accept": RAW_MEDIA_TYPE})
 
     if response.status_code == 200:
-        readme_data = response.json()
-        readme_content = requests.get(readme_data["download_url"]).text
-        return readme_content
-    return None
+        return response.content.decode("utf-8", errors="replace"), git_blob_sha(
+            response.content
+        )
+    return None, None
+
+
+# Fetch READMEs for many repos at once, falling back to one request per miss
+def get_readmes(owner, repo_names):
+    readmes = fetch_readmes_batch(
+        GITHUB_SESSION,
+        owner,
+        list(repo_names),
+        headers=HEADERS,
+        graphql_url=GITHUB_GRAPHQL_URL,
+    )
+    for repo_name in repo_names:
+        if repo_name not in readmes:
+            readmes[repo_name] = get_readme(owner, repo_name)
+    return readmes
+
+
+# Fetch README content
+def get_readme_content(owner, repo):
+    return get_readme(owner, repo)[0]
+
+
+def openai_api_call(prompt, model="gpt-4o-mini", retries=3, delay=5, validate=None):
+    # Unchanged prompts are answered from the shared LLM cache; replies that
+    # fail validate() are not cached, so the next run asks again
+    cache = get_default_cache()
+    if cache is None:
+        return _openai_api_request(prompt, retries=retries, delay=delay)
+    return cache.get_or_call(
+        api_model,
+        prompt,
+        None,
+        lambda: _openai_api_request(prompt, retries=retries, delay=delay),
+        validate=validate,
+    )
 
 
-def openai_api_call( prompt, model="gpt-4o-mini", retries=3, delay=5):
+def _openai_api_request(prompt, retries=3, delay=5):
     # Set the endpoint URL and headers
-    urls = [
-        "https://heisenberg-duckduckgo-12.deno.dev/v1/chat/completions",
-        "https://heisenberg-duckduckgo-66.deno.dev/v1/chat/completions",
-        "https://heisenberg-duckduckgo-38.deno.dev/v1/chat/completions",
-    ]
     headers = {
         "Authorization": f"Bearer {api_key}",
         "Content-Type": "application/json",
@@ -168,22 +346,20 @@ def openai_api_call( prompt, model="gpt-4o-mini", retries=3, delay=5):
         "model": api_model,
         "messages": [{"role": "user", "content": prompt}],
     }
-    for attempt in range(retries):
-        url = urls[attempt]
 
-        try:
-            response = requests.post(url, headers=headers, json=data)
-
-            # Check for a successful response
-            if response.status_code == 200:
-                data = response.json()
-                result = data["choices"][0]["message"]["content"]
-                return result
-            else:
-                print(
-                    f"Request {url} failed with status code  {response.status_code}: {response.text}"
-                )
+    def request(url):
+        # The pool fails over to another endpoint, so don't retry this one
+        response = get_http_client().post(url, headers=headers, json=data, retries=0)
+        if response.status_code != 200:
+            raise RuntimeError(
+                f"status code {response.status_code}: {response.text[:200]}"
+            )
+        return response.json()["choices"][0]["message"]["content"]
 
+    # Each round tries every endpoint, healthiest first
+    for attempt in range(retries):
+        try:
+            return LLM_ENDPOINTS.call(request)
         except Exception as e:
             print("Error call openai api endpoint", e)
 
@@ -205,7 +381,9 @@ def siliconflow(text, token, model="Qwen2.5"):
         "Content-Type": "application/json",
     }
 
-    response = requests.request("POST", api_url, json=payload, headers=headers)
+    response = get_http_client().post(
+        api_url, json=payload, headers=headers, idempotent=True
+    )
 
     print(response.text)
     data = response.json()
@@ -218,37 +396,100 @@ def siliconflow(text, token, model="Qwen2.5"):
     return None
 
 
+async def run_stage(pipeline, stage, func, *args, **kwargs):
+    # Run a blocking call through the pipeline, or inline when there is none
+    if pipeline is None:
+        return func(*args, **kwargs)
+    return await pipeline.run(stage, func, *args, **kwargs)
+
+
+KEYWORDS_AND_TAGS_PROMPT = """Extract keywords and tags from the following text:
+{text}
+
+Return only a JSON object, no prose and no code fence, in this form:
+{{"keywords": ["keyword", ...], "tags": ["tag", ...]}}
+Use at most 15 keywords and 10 tags; tags are short topic labels."""
+
+
+def _as_string_list(value):
+    # Accept a JSON list or a comma separated string, drop blanks and repeats
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, list):
+        return None
+    items = []
+    for item in value:
+        if isinstance(item, (str, int, float)) and not isinstance(item, bool):
+            item = str(item).strip()
+            if item and item not in items:
+                items.append(item)
+    return items
+
+
+def parse_keywords_and_tags(response):
+    # Validate the JSON reply of KEYWORDS_AND_TAGS_PROMPT; None if unusable
+    if not response:
+        return None
+    start, end = response.find("{"), response.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(response[start : end + 1])
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    keywords = _as_string_list(data.get("keywords", []))
+    tags = _as_string_list(data.get("tags", []))
+    if keywords is None or tags is None or not (keywords or tags):
+        return None
+    return keywords, tags
+
+
+def _split_reply(response):
+    # Free-form "label: a, b" or one-per-line replies of the two-call mode
+    if not response:
+        return []
+    response = response.split(":", 1)[1] if ":" in response else response
+    return [item.strip() for item in response.replace("\n", ",").split(",") if item.strip()]
+
+
 # Extract keywords and tags using Chat class
-async def extract_keywords_and_tags(text):
+async def extract_keywords_and_tags(text, pipeline=None):
     text = text[:3000]
-    prompt = f"Extract keywords from the following text:\n{text}\n, return keywords as comma separator:"
-    keywords_response = openai_api_call(prompt=prompt)
-    print("---------generated keywords", keywords_response)
+    if KEYWORD_EXTRACTION == "json":
+        # One round trip for both lists; a bad reply falls back to two calls
+        response = await run_stage(
+            pipeline,
+            "tags",
+            openai_api_call,
+            prompt=KEYWORDS_AND_TAGS_PROMPT.format(text=text),
+            validate=lambda reply: parse_keywords_and_tags(reply) is not None,
+        )
+        parsed = parse_keywords_and_tags(response)
+        if parsed is not None:
+            keywords, tags = parsed
+            print("---------generated keywords", keywords)
+            print("---------generated tags", tags)
+            return keywords, replace_non_word_characters(tags)
+        print("---------keywords/tags reply is not valid JSON, asking separately", response)
+    return await extract_keywords_and_tags_separately(text, pipeline=pipeline)
+
 
-    keywords = (
-        keywords_response.split(":")[1]
-        if ":" in keywords_response
-        else keywords_response
+async def extract_keywords_and_tags_separately(text, pipeline=None):
+    prompt = f"Extract keywords from the following text:\n{text}\n, return keywords as comma separator:"
+    keywords_response = await run_stage(
+        pipeline, "tags", openai_api_call, prompt=prompt
     )
-    keywords = keywords.split(",")
+    print("---------generated keywords", keywords_response)
+    keywords = _split_reply(keywords_response)
 
     prompt = f"Extract tags from the following text:\n{text}\n, return tags as comma separator"
-    tags_response = openai_api_call(prompt=prompt)
-    print("---------generated tags", tags_response)
-    tags_response = (
-        tags_response.split(":")[1] if ":" in tags_response else tags_response
+    tags_response = await run_stage(
+        pipeline, "tags", openai_api_call, prompt=prompt
     )
-    if "\n" in tags_response:
-        tags_response = tags_response.split("\n")
-
-        tags_response = ",".join(tags_response)
-    tags = tags_response.split(",") if "," in tags_response else tags_response
     print("---------generated tags", tags_response)
-
-    tags = replace_non_word_characters(tags)
-    if not isinstance(tags, list):
-
-        print("---------generated tags is not list", tags)
+    tags = replace_non_word_characters(_split_reply(tags_response))
 
     return keywords, tags
 
@@ -287,7 +528,7 @@ def call_image_endpoint_local(api_url, api_key, prompt, size="1024x1024", n=1):
         "messages": [{"role": "user", "content": prompt}],
         "model": FLUX_MODEL,
     }
-    response = requests.post(api_url, headers=headers, data=json.dumps(data))
+    response = get_http_client().post(api_url, headers=headers, data=json.dumps(data))
 
     if response.status_code == 200:
         result = response.json()
@@ -311,24 +552,28 @@ def call_image_endpoint_local(api_url, api_key, prompt, size="1024x1024", n=1):
     return None
 
 
-def save_image_from_url(image_url, local_file_path):
-    # Send a GET request to the image URL
-    response = requests.get(image_url)
+def save_image_from_url(image_url, folder=None):
+    # Stream the image into the content-addressed asset store; returns its file name
+    folder = folder or assets_save_folder
+    try:
+        image_name = store_download(image_url, folder, max_bytes=IMAGE_MAX_BYTES)
+    except Exception as e:
+        print(f"Failed to retrieve image {image_url}: {e}")
+        return None
+    print(f"Image saved successfully to {os.path.join(folder, image_name)}")
+    return image_name
 
-    # Check if the request was successful (status code 200)
-    if response.status_code == 200:
-        # Open a local file in binary write mode
-        with open(local_file_path, "wb") as file:
-            # Write the content of the response (the image) to the file
-            file.write(response.content)
-        print(f"Image saved successfully to {local_file_path}")
-    else:
-        print(f"Failed to retrieve image. Status code: {response.status_code}")
 
+def placeholder_cover(repo_name, images):
+    # Same default image for the same repo on every run; images is the
+    # sorted get_default_images() list
+    index = int(hashlib.sha256(repo_name.encode("utf-8")).hexdigest(), 16) % len(images)
+    return domain + assets_read_folder + images[index]
 
-def call_image_endpoint(api_url, api_key, prompt, size="1024x1024", n=1):
+
+def generate_cover_image(api_url, api_key, prompt, size="1024x1024", n=1):
     """
-    Calls the Cloudflare Worker image generation endpoint.
+    Calls the Cloudflare Worker image generation endpoint and downloads the image.
 
     Args:
         api_url (str): The endpoint URL of the Cloudflare Worker.
@@ -338,7 +583,7 @@ def call_image_endpoint(api_url, api_key, prompt, size="1024x1024", n=1):
         n (int, optional): The number of images to generate. Defaults to 1.
 
     Returns:
-        dict: The JSON response from the endpoint.
+        str: The public URL of the saved image, or None if none was made.
     """
     prompt = prompt[:1000]
     headers = {
@@ -349,35 +594,31 @@ def call_image_endpoint(api_url, api_key, prompt, size="1024x1024", n=1):
         "messages": [{"role": "user", "content": prompt}],
         "stream": False,
     }
-    image_url = None
     try:
-        response = requests.post(api_url, json=payload, headers=headers)
+        response = get_http_client().post(api_url, json=payload, headers=headers)
 
         if response.status_code == 200:
             data = response.json()
             if data:
-                try:
-                    url = data["choices"][0]["message"]["url"]
-                    print("create image", url)
-                    image_name = url.split("/")[-1] + ".png"
-                    assets_save_folder = os.path.join(project_root, assets_save_folder)
-
-                    local_file_path = os.path.join(
-                        assets_save_folder, image_name
-                    )
-                    save_image_from_url(url, local_file_path)
-
-                    image_url = domain + assets_read_folder + image_name
-
-                except:
-                    image_name = random.choice(defaultimages)
+                url = data["choices"][0]["message"]["url"]
+                print("create image", url)
+                # Stored under its content hash, so identical covers share one file
+                image_name = save_image_from_url(url)
+                if image_name:
+                    return domain + assets_read_folder + image_name
         else:
             print("error:\n", response.status_code, "message:\n", response.text)
     except Exception as e:
         print("error image creation", e)
+    return None
+
+
+def call_image_endpoint(api_url, api_key, prompt, size="1024x1024", n=1):
+    # Generated cover URL, or a default image when generation fails
+    image_url = generate_cover_image(api_url, api_key, prompt, size=size, n=n)
     if image_url is None:
-        image_name = random.choice(defaultimages)
-        image_url = domain + assets_read_folder + image_name
+        image_url = domain + assets_read_folder + random.choice(get_default_images())
+    return image_url
 
 
 def generate_blog(
@@ -388,12 +629,15 @@ def generate_blog(
     current_date=None,
     assets_read_folder=None,
     assets_save_folder=None,
+    commits=None,
 ):
     if current_date is None:
         current_date = datetime.datetime.now().strftime("%Y%m%d %H%M%S")
 
     if username is None:
         username = "wanghaisheng"
+    from bloghelper import EnhancedBlogGenerator
+
     generator = EnhancedBlogGenerator(
         current_date=current_date,
         username=username,
@@ -401,6 +645,9 @@ def generate_blog(
         api_key=api_key,
         model_name="gpt-4",
         temperature=0.7,
+        section_workers=SECTION_WORKERS,
+        chart_backend=CHART_BACKEND,
+        readme_tokens=README_CONTEXT_TOKENS,
     )
     blog_post, title = generator.generate_blog_post(
         repo_name=repo_name,
@@ -409,51 +656,127 @@ def generate_blog(
         repo_path=".",
         assets_save_folder=assets_save_folder,
         assets_read_folder=assets_read_folder,
+        commits=commits,
+    )
+    PROMPT_USAGE.append(
+        (repo_name, generator.usage["calls"], generator.usage["prompt_tokens"])
     )
     print("generate title", title)
     return blog_post, title
 
 
 # Create Markdown file for each repository
-def update_apple_blog_tags_json(tags):
-    new = {}
-    # tags=replace_non_word_characters(tags)
+_tag_index = None
+
+
+def get_tag_index():
+    # Tags of every post, normalized and counted; written once per run
+    global _tag_index
+    if _tag_index is None:
+        _tag_index = TagIndex(
+            TAGS_SERVER_DIR_STORAG, normalize=replace_non_word_characters
+        )
+    return _tag_index
+
+
+def update_apple_blog_tags_json(repo_name, tags):
+    # Only updates the in-memory index, save_tag_index() writes tags.json
+    return get_tag_index().add(repo_name, tags)
+
 
-    if os.path.exists(TAGS_SERVER_DIR_STORAG):
-        print("overwrite old tags.json")
-        new = []
+def save_tag_index():
+    if _tag_index is not None:
+        _tag_index.save()
+        print("save tag json file")
+
+
+IMAGE_LINK_RE = re.compile(r"(!\[[^\]]*\]\()([^)\s]+)(\))")
+
+
+def asset_file_name(url):
+    # File name in assets_save_folder of a local asset URL, else None
+    if not url or not assets_read_folder:
+        return None
+    if domain and url.startswith(domain):
+        url = url[len(domain):]
+    if not url.startswith(assets_read_folder):
+        return None
+    name = url[len(assets_read_folder):]
+    return name if name and "/" not in name else None
+
+
+def variant_url(url, label):
+    # Same URL pointing at an optimized variant, or the URL itself
+    name = asset_file_name(url)
+    optimizer = get_asset_optimizer()
+    variant = optimizer.variant(name, label) if name and optimizer else None
+    return url[: -len(name)] + variant if variant else url
+
+
+def optimized_cover_urls(cover_image_url):
+    # (url, square) of a cover, made from its WebP variants when there are any
+    optimizer = get_asset_optimizer()
+    if optimizer is not None:
+        optimizer.optimize([asset_file_name(cover_image_url)])
+    return variant_url(cover_image_url, "large"), variant_url(cover_image_url, "square")
+
+
+def optimize_post_assets(md_paths):
+    """Make WebP variants of the covers and charts of the given posts and
+    point the posts at them; images already optimized are skipped."""
+    optimizer = get_asset_optimizer()
+    if optimizer is None:
+        return
+    posts, names = {}, []
+    for md_path in md_paths:
         try:
-            old = json.load(open(TAGS_SERVER_DIR_STORAG), encoding="utf8").get(
-                "tags", []
-            )
-            new = old + list(set(tags))
-        except Exception as e:
-            print("old tag json error", e)
-            new = tags
-        new = list(set(new))
-        tags = replace_non_word_characters(tags)
-        with open(TAGS_SERVER_DIR_STORAG, "w", encoding="utf-8") as file:
-            json.dump({"tags": new}, file, ensure_ascii=False, indent=2)
-            print("save tag json file")
-    else:
-        print("create new tags.json")
-        new = list(set(tags))
-        tags = replace_non_word_characters(tags)
+            with open(md_path, "r", encoding="utf-8") as file:
+                frontmatter, body = split_frontmatter(file.read())
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            print(f"Could not read {md_path} for asset optimization: {e}")
+            continue
+        posts[md_path] = (frontmatter, body)
+        names.append(asset_file_name((frontmatter.get("cover") or {}).get("url")))
+        names.extend(asset_file_name(m.group(2)) for m in IMAGE_LINK_RE.finditer(body))
+    optimized = optimizer.optimize(names)
+    print(f"optimized images: {len(optimized)}")
+
+    for md_path, (frontmatter, body) in posts.items():
+        new_body = IMAGE_LINK_RE.sub(
+            lambda m: m.group(1) + variant_url(m.group(2), "large") + m.group(3), body
+        )
+        cover = frontmatter.get("cover") or {}
+        cover_url = cover.get("url")
+        large_url = variant_url(cover_url, "large")
+        if large_url != cover_url:
+            cover.update(url=large_url, square=variant_url(cover_url, "square"))
+        elif new_body == body:
+            continue
+        try:
+            write_post(md_path, frontmatter, new_body)
+            print(f"Optimized images patched into {md_path}")
+        except OSError as e:
+            print(f"Could not patch optimized images into {md_path}: {e}")
 
-        os.makedirs(os.path.dirname(TAGS_SERVER_DIR_STORAG), exist_ok=True)
 
-        with open(TAGS_SERVER_DIR_STORAG, "w", encoding="utf-8") as file:
-            json.dump({"tags": new}, file, ensure_ascii=False, indent=2)
+def prune_asset_variants():
+    # Drop variants whose original image was removed
+    if _asset_optimizer is None:
+        return
+    for path in _asset_optimizer.prune():
+        print(f"Removed stale image variant {path}")
+    _asset_optimizer.save()
 
 
 def build_frontmatter_appleblog(
-    author, cover_image_url, description, keywords, pubdate, tags, title
+    author, cover_image_url, description, keywords, pubdate, tags, title,
+    cover_square_url=None,
 ):
     frontmatter = {
         "author": author,
         "cover": {
             "alt": "cover",
-            "square": cover_image_url,
+            "square": cover_square_url or cover_image_url,
             "url": cover_image_url,
         },
         "description": description,
@@ -517,16 +840,18 @@ def create_all_markdown_files(repos, username, chat, days_threshold=30):
             )
         )
         if theme == "appleblog":
-            update_apple_blog_tags_json(tags)
+            update_apple_blog_tags_json(repo_name, tags)
 
         # Select author
         author = select_author()
 
         # Construct Markdown content
         if theme == "appleblog":
+            cover_image_url, cover_square_url = optimized_cover_urls(cover_image_url)
             frontmatter = build_frontmatter_appleblog(
                 author=author,
                 cover_image_url=cover_image_url,
+                cover_square_url=cover_square_url,
                 description=description,
                 keywords=", ".join(keywords),
                 pubdate=date_today,
@@ -554,99 +879,255 @@ def create_all_markdown_files(repos, username, chat, days_threshold=30):
         with open(filename, "w", encoding="utf-8") as file:
             file.write(md_content)
         print(f"Markdown file created: {filename}")
+    save_tag_index()
+
+
+async def build_repo_post(
+    repo, username, pipeline, date_today, ledger=None, readme=None, covers=None,
+    default_images=None,
+):
+    # Run every network-bound stage for one repo and return what to write
+    repo_name = repo["name"]
+    repo_url = repo["html_url"]
+    stars_count = repo["stargazers_count"]
+    forks_count = repo["forks_count"]
+    description = repo["description"] or "No description provided."
+
+    # Fetch README content or fallback to description
+    if readme is None:
+        readme = await pipeline.run("readme", get_readme, username, repo_name)
+    readme_content, readme_sha = readme
+    readme_content = readme_content or description
+    inputs_hash = compute_inputs_hash(repo_name, description, readme_content)
+    result = {
+        "repo_name": repo_name,
+        "pushed_at": repo.get("pushed_at"),
+        "readme_sha": readme_sha,
+        "inputs_hash": inputs_hash,
+    }
+
+    # Pushed, but nothing the post is built from changed
+    md_filename = os.path.join(OUTPUT_FOLDER, f"{repo_name}.md")
+    if (
+        ledger is not None
+        and os.path.exists(md_filename)
+        and ledger.is_content_unchanged(repo_name, inputs_hash)
+    ):
+        result["skipped"] = True
+        return result
+
+    # The cover image is made in the background; the post starts out with a
+    # placeholder that covers.finish() swaps for the real image
+    cover_prompt = f"A creative image representing the repository: {readme_content}"
+    if covers is not None:
+        covers.submit(repo_name, cover_prompt)
+        cover_task = asyncio.sleep(
+            0, result=placeholder_cover(repo_name, default_images)
+        )
+    else:
+        cover_task = pipeline.run(
+            "image",
+            call_image_endpoint,
+            api_url=IMAGE_API_URL,
+            api_key=IMAGE_API_KEY,
+            prompt=cover_prompt,
+        )
+
+    # Blog text and tags only depend on the README, so run them together
+    blog_task = pipeline.run(
+        "blog",
+        generate_blog,
+        repo_name,
+        repo_description=description,
+        readme_content=readme_content,
+        username=username,
+        current_date=None,
+        assets_save_folder=assets_save_folder,
+        assets_read_folder=assets_read_folder,
+        commits=repo.get("commits"),
+    )
+    # Extract keywords and tags using Chat class
+    tags_task = extract_keywords_and_tags(
+        f"{repo_name} {description} {readme_content}", pipeline=pipeline
+    )
+    (blogmd, title), cover_image_url, (keywords, tags) = await asyncio.gather(
+        blog_task, cover_task, tags_task
+    )
+    if title is None:
+        title = repo_name
+
+    # Select author
+    author = select_author()
+
+    # Construct Markdown content
+    if theme == "appleblog":
+        frontmatter = build_frontmatter_appleblog(
+            author=author,
+            cover_image_url=cover_image_url,
+            description=description,
+            keywords=", ".join(keywords),
+            pubdate=date_today,
+            tags=tags,
+            title=title,
+        )
+
+    md_content = f"""---\n{frontmatter}---\n
+
+{blogmd}
+
+* Repository URL: [{repo_url}]({repo_url})
+* Stars: **{stars_count}**
+* Forks: **{forks_count}**
+"""
+    result.update(md_content=md_content, tags=tags)
+    return result
 
 
 # 你想多久运行一次程序就设置时间间隔为多久 一个月 一周 一天
 async def create_new_markdown_files(repos, username, days_threshold=1):
     date_today = datetime.date.today().strftime("%Y-%m-%d")
-    pubdate = datetime.datetime.now().strftime("%Y%m%d %H%M%S")
+    ledger = RepoStateLedger(REPO_STATE_FILE)
 
+    pending = []
     for repo in repos:
         # Skip repositories that haven't been updated recently
         if not is_recently_updated(repo, days_threshold):
             print(f"Skipping {repo['name']} (not updated recently).")
             continue
 
-        repo_name = repo["name"]
-        repo_url = repo["html_url"]
-        stars_count = repo["stargazers_count"]
-        forks_count = repo["forks_count"]
-        description = repo["description"] or "No description provided."
-        is_forked = repo["fork"]
-
-        # Check if markdown file already exists for this repository
-        md_filename = os.path.join(OUTPUT_FOLDER, f"{repo_name}.md")
+        md_filename = os.path.join(OUTPUT_FOLDER, f"{repo['name']}.md")
         if os.path.exists(md_filename):
-            print(f"Skipping {repo_name} (markdown file already exists).")
-            continue
+            if ledger.is_listing_unchanged(repo):
+                print(f"Skipping {repo['name']} (no push since last post).")
+                continue
+            if ledger.get(repo["name"]) is None:
+                # Post predates the ledger: adopt it instead of regenerating everything
+                print(f"Skipping {repo['name']} (markdown file already exists).")
+                ledger.record(repo["name"], repo.get("pushed_at"))
+                continue
+        pending.append(repo)
+
+    if not pending:
+        ledger.save()
+        return
+
+    pipeline = RepoPipeline(
+        workers=PIPELINE_WORKERS, stage_limits=PIPELINE_STAGE_LIMITS
+    )
+    print(f"processing {len(pending)} repos with {pipeline.workers} workers")
+    covers = CoverImageQueue(
+        functools.partial(generate_cover_image, IMAGE_API_URL, IMAGE_API_KEY),
+        workers=pipeline.stage_limits["image"],
+    )
+    written = []
 
-        # Fetch README content or fallback to description
-        readme_content = get_readme_content(username, repo_name) or description
-        blogmd, title = generate_blog(
-            repo_name,
-            repo_description=description,
-            readme_content=readme_content,
-            username=username,
-            current_date=None,
-            assets_save_folder=assets_save_folder,
-            assets_read_folder=assets_read_folder,
+    def write_result(repo, result):
+        # Called as soon as a repo's stages finish, so a post is on disk
+        # while the rest of the batch is still generating
+        if result.get("skipped"):
+            print(f"Skipping {repo['name']} (content unchanged).")
+        else:
+            if theme == "appleblog":
+                update_apple_blog_tags_json(result["repo_name"], result["tags"])
+
+            # Save to .md file in the output folder
+            md_filename = os.path.join(OUTPUT_FOLDER, f"{result['repo_name']}.md")
+            with open(md_filename, "w", encoding="utf-8") as file:
+                file.write(result["md_content"])
+            print(f"Markdown file created: {md_filename}")
+            covers.attach(result["repo_name"], md_filename)
+            written.append(md_filename)
+        ledger.record(
+            result["repo_name"],
+            result["pushed_at"],
+            result["readme_sha"],
+            result["inputs_hash"],
         )
-        if title is None:
-            title = repo_name
 
-        # Generate cover image based on the description or repository name
-        cover_image_url = call_image_endpoint(
-            api_url=IMAGE_API_URL,
-            api_key=IMAGE_API_KEY,
-            prompt=f"A creative image representing the repository: {readme_content}",
+    async def build_and_write(repo):
+        result = await build_repo_post(
+            repo,
+            username,
+            pipeline,
+            date_today,
+            ledger=ledger,
+            readme=(
+                (repo["readme"] or (None, None))
+                if "readme" in repo
+                else readmes.get(repo["name"])
+            ),
+            covers=covers,
+            default_images=default_images,
         )
+        write_result(repo, result)
 
-        # Extract keywords and tags using Chat class
-        keywords, tags = await extract_keywords_and_tags(
-            f"{repo_name} {description} {readme_content}"
+    try:
+        # The GraphQL listing already carries READMEs, only fetch the others
+        readmes = await pipeline.run(
+            "readme",
+            get_readmes,
+            username,
+            [repo["name"] for repo in pending if "readme" not in repo],
         )
-        if theme == "appleblog":
-            update_apple_blog_tags_json(tags)
-
-        # Select author
-        author = select_author()
-
-        # Construct Markdown content
-        if theme == "appleblog":
-            frontmatter = build_frontmatter_appleblog(
-                author=author,
-                cover_image_url=cover_image_url,
-                description=description,
-                keywords=", ".join(keywords),
-                pubdate=date_today,
-                tags=tags,
-                title=title,
-            )
-
-        md_content = f"""---\n{frontmatter}---\n
-
-{blogmd}
-
-* Repository URL: [{repo_url}]({repo_url})
-* Stars: **{stars_count}**
-* Forks: **{forks_count}**
-"""
-
-        # Save to .md file in the output folder
-        with open(md_filename, "w", encoding="utf-8") as file:
-            file.write(md_content)
-        print(f"Markdown file created: {md_filename}")
+        # Placeholder covers come from this list; preparedefaultimage() does
+        # network I/O, so load it once off the event loop
+        default_images = sorted(await pipeline.run("image", get_default_images))
+        results = await pipeline.map(build_and_write, pending)
+    finally:
+        pipeline.shutdown()
+
+    for repo, result in zip(pending, results):
+        if isinstance(result, Exception):
+            print(f"Failed to create markdown for {repo['name']}: {result}")
+    ledger.save()
+    save_tag_index()
+    # Posts are on disk with placeholders; swap in covers as they finish
+    covers.finish()
+    # Then point covers and charts at their downscaled WebP variants
+    optimize_post_assets(written)
+
+
+def collect_chart_garbage():
+    # Drop chart images of repos that no longer have a post
+    chart_cache = get_chart_cache(assets_save_folder)
+    if chart_cache is None or not os.path.isdir(OUTPUT_FOLDER):
+        return
+    posts = {
+        os.path.splitext(name)[0]
+        for name in os.listdir(OUTPUT_FOLDER)
+        if name.endswith(".md")
+    }
+    for path in chart_cache.collect_garbage(posts):
+        print(f"Removed stale chart {path}")
+    print(
+        f"chart cache stats: {chart_cache.hits} hits, {chart_cache.misses} misses"
+    )
 
 
 # Main execution
 async def main():
     try:
+        prepare_run()
         print("main function start")
         # Initialize the chat with the model from config
         # Get the username from config
         username = config.get("username", "default_username")
         print("start to detect all repos")
-        repos = get_repositories(username)[:20]
+        repos = None
+        if GITHUB_SOURCE == "graphql":
+            pushed_after = (
+                datetime.datetime.utcnow()
+                - datetime.timedelta(days=days_threshold + 1)
+            ).strftime("%Y-%m-%dT%H:%M:%SZ")
+            repos = fetch_repositories_graphql(
+                GITHUB_SESSION,
+                username,
+                headers=HEADERS,
+                pushed_after=pushed_after,
+                graphql_url=GITHUB_GRAPHQL_URL,
+            )
+        if repos is None:
+            repos = list(get_repositories(username, days_threshold=days_threshold))
         if not repos:
             print("No repositories found or failed to fetch repositories.")
             return
@@ -657,6 +1138,23 @@ async def main():
     except Exception as e:
         print(f"Exception in main: {e}")
         traceback.print_exc()
+    finally:
+        shutdown_chart_renderer()
+        collect_chart_garbage()
+        save_chart_caches()
+        prune_asset_variants()
+        cache = get_default_cache()
+        if cache is not None:
+            print("llm cache stats", cache.stats())
+        if _http_cache is not None:
+            print("http cache stats", _http_cache.stats())
+        print("llm endpoint stats", LLM_ENDPOINTS.stats())
+        if PROMPT_USAGE:
+            total = sum(tokens for _, _, tokens in PROMPT_USAGE)
+            print(
+                f"blog prompt tokens: {total} for {len(PROMPT_USAGE)} posts, "
+                f"{total // len(PROMPT_USAGE)} per post"
+            )
 
 
 # Run the async main function
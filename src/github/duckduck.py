@@ -2,6 +2,7 @@ import asyncio
 import random
 import requests
 import json
+from httpclient import get_http_client
 
 STATUS_URL = "https://duckduckgo.com/duckchat/v1/status"
 CHAT_URL = "https://duckduckgo.com/duckchat/v1/chat"
@@ -30,7 +31,7 @@ class Chat:
             "messages": self.messages,
         }
         headers = {"x-vqd-4": self.new_vqd, "Content-Type": "application/json"}
-        response = requests.post(CHAT_URL, headers=headers, json=payload)
+        response = get_http_client().post(CHAT_URL, headers=headers, json=payload, idempotent=True)
 
         if not response.ok:
             raise Exception(f"{response.status_code}: Failed to send message. {response.text}")
@@ -80,7 +81,7 @@ class Chat:
 
 async def init_chat(model_alias: str) -> Chat:
     """ Initialize a chat with the given model alias. """
-    status = requests.get(STATUS_URL, headers=STATUS_HEADERS)
+    status = get_http_client().get(STATUS_URL, headers=STATUS_HEADERS)
     vqd = status.headers.get("x-vqd-4")
     if not vqd:
         raise Exception(f"{status.status_code}: Failed to initialize chat. {status.text}")
@@ -1,6 +1,24 @@
-import requests
+import json
+from httpclient import get_http_client
+from llmcache import get_default_cache
+
+# Entries here hold the whole JSON reply, not the message text the other
+# callers store, so they get their own model name in the shared cache key
+CACHE_MODEL = "duckduckgo/gpt-4o-mini"
 
 def openai_api_call(api_key, prompt,model='gpt-4o-mini'):
+    # Successful replies are kept in the shared LLM cache as raw JSON
+    cache = get_default_cache()
+    if cache is not None:
+        cached = cache.get(CACHE_MODEL, prompt, None)
+        if cached is not None:
+            return json.loads(cached)
+    result = _openai_api_request(api_key, prompt)
+    if cache is not None and "error" not in result:
+        cache.set(CACHE_MODEL, prompt, None, json.dumps(result, ensure_ascii=False))
+    return result
+
+def _openai_api_request(api_key, prompt):
     # Set the endpoint URL and headers
     url='https://heisenberg-duckduckgo-66.deno.dev/v1/chat/completions'
 
@@ -14,7 +32,7 @@ def openai_api_call(api_key, prompt,model='gpt-4o-mini'):
     data = {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": prompt}]}
 
     # Make the request
-    response = requests.post(url, headers=headers, json=data)
+    response = get_http_client().post(url, headers=headers, json=data, idempotent=True)
 
     # Check for a successful response
     if response.status_code == 200:
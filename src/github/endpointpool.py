@@ -0,0 +1,198 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Endpoint:
+    """Health record of one upstream URL."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.latency = None  # EWMA of successful call latency, seconds
+        self.error_rate = 0.0  # EWMA of failures, 0..1
+        self.consecutive_failures = 0
+        self.last_failure = 0.0
+        self.open_until = 0.0  # circuit open (skipped) until this time
+        self.opened = 0  # times the circuit has opened in a row
+        self.requests = 0
+        self.errors = 0
+
+    def is_open(self, now: float) -> bool:
+        return now < self.open_until
+
+    def score(self, default_latency: float = 1.0) -> float:
+        # Untried endpoints score 0 so they get probed once; ones that have
+        # failed without a timed success count as ``default_latency``
+        if self.requests == 0:
+            return 0.0
+        latency = self.latency if self.latency is not None else default_latency
+        return latency * (1.0 + 4.0 * self.error_rate)
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "latency": round(self.latency, 3) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "requests": self.requests,
+            "errors": self.errors,
+            "open": self.is_open(time.monotonic()),
+        }
+
+
+class EndpointPool:
+    """Route calls to the healthiest of several equivalent endpoints.
+
+    Each endpoint keeps an EWMA of its latency and error rate; calls go to
+    the lowest ``latency * (1 + 4 * error_rate)``, where an endpoint never
+    timed counts as the slowest one that was.  An endpoint whose last call
+    failed gets a probe call once ``cooldown`` seconds have passed, since its
+    error rate only recovers on success.  ``failure_threshold``
+    failures in a row open the endpoint's circuit for ``cooldown`` seconds
+    (doubling on each re-open, up to ``max_cooldown``); after that one call
+    is let through and a success closes it again.  With ``hedge_after`` set,
+    a call still running after that many seconds is raced against the next
+    best endpoint and the first success wins.
+    """
+
+    def __init__(self, urls, alpha: float = 0.3, failure_threshold: int = 3,
+                 cooldown: float = 60.0, max_cooldown: float = 900.0,
+                 hedge_after: float = None, max_workers: int = 8):
+        if not urls:
+            raise ValueError("EndpointPool needs at least one URL")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.hedge_after = hedge_after
+        self.hedged = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._max_workers = max_workers
+
+    def _ranked(self, exclude=()) -> list:
+        """Endpoints to try, healthiest first; open circuits only as a last resort."""
+        now = time.monotonic()
+        with self._lock:
+            candidates = [e for e in self.endpoints if e not in exclude]
+            default_latency = max((e.latency for e in self.endpoints if e.latency is not None), default=1.0)
+
+            def score(endpoint):
+                if endpoint.consecutive_failures and now >= endpoint.last_failure + self.cooldown:
+                    return 0.0
+                return endpoint.score(default_latency)
+
+            closed = sorted((e for e in candidates if not e.is_open(now)), key=score)
+            # Soonest to close first
+            opened = sorted((e for e in candidates if e.is_open(now)), key=lambda e: e.open_until)
+        return closed + opened
+
+    def record_success(self, endpoint: Endpoint, latency: float):
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.latency = (
+                latency if endpoint.latency is None
+                else self.alpha * latency + (1 - self.alpha) * endpoint.latency
+            )
+            endpoint.error_rate *= 1 - self.alpha
+            endpoint.consecutive_failures = 0
+            endpoint.opened = 0
+            endpoint.open_until = 0.0
+
+    def record_failure(self, endpoint: Endpoint):
+        with self._lock:
+            endpoint.requests += 1
+            endpoint.errors += 1
+            endpoint.error_rate = self.alpha + (1 - self.alpha) * endpoint.error_rate
+            endpoint.consecutive_failures += 1
+            endpoint.last_failure = time.monotonic()
+            if endpoint.consecutive_failures >= self.failure_threshold:
+                cooldown = min(self.cooldown * (2 ** endpoint.opened), self.max_cooldown)
+                endpoint.open_until = time.monotonic() + cooldown
+                endpoint.opened += 1
+                # The half-open trial gets a single chance
+                endpoint.consecutive_failures = self.failure_threshold - 1
+                logging.warning(f"Endpoint {endpoint.url} failing, skipping it for {cooldown:.0f}s")
+
+    def _attempt(self, endpoint: Endpoint, func):
+        started = time.monotonic()
+        try:
+            result = func(endpoint.url)
+        except Exception:
+            self.record_failure(endpoint)
+            raise
+        self.record_success(endpoint, time.monotonic() - started)
+        return result
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers,
+                                                    thread_name_prefix="hedge")
+            return self._executor
+
+    def call(self, func, attempts: int = None):
+        """Run ``func(url)`` on the best endpoint, failing over on exceptions.
+
+        ``func`` should raise on any unusable reply.  Up to ``attempts``
+        endpoints are tried (default: all of them); the last error is raised
+        when none succeeds.
+        """
+        attempts = attempts or len(self.endpoints)
+        if self.hedge_after is None:
+            return self._call_sequential(func, attempts)
+        return self._call_hedged(func, attempts)
+
+    def _call_sequential(self, func, attempts: int):
+        tried, last_error = [], None
+        for _ in range(attempts):
+            ranked = self._ranked(exclude=tried)
+            if not ranked:
+                break
+            endpoint = ranked[0]
+            tried.append(endpoint)
+            try:
+                return self._attempt(endpoint, func)
+            except Exception as e:
+                logging.warning(f"Request to {endpoint.url} failed: {e}")
+                last_error = e
+        raise last_error or RuntimeError("no endpoint available")
+
+    def _call_hedged(self, func, attempts: int):
+        pool = self._pool()
+        tried, running, last_error = [], {}, None
+
+        def launch():
+            ranked = self._ranked(exclude=tried)
+            if not ranked or len(tried) >= attempts:
+                return False
+            tried.append(ranked[0])
+            running[pool.submit(self._attempt, ranked[0], func)] = ranked[0]
+            return True
+
+        launch()
+        while running:
+            # Wait for a result, or hedge once the slowest allowance is used up
+            done, _ = wait(list(running), timeout=self.hedge_after, return_when=FIRST_COMPLETED)
+            if not done:
+                if launch():
+                    with self._lock:
+                        self.hedged += 1
+                continue
+            for future in done:
+                endpoint = running.pop(future)
+                try:
+                    # Losing hedges finish in the background and still update health
+                    return future.result()
+                except Exception as e:
+                    logging.warning(f"Request to {endpoint.url} failed: {e}")
+                    last_error = e
+            if not running:
+                launch()
+        raise last_error or RuntimeError("no endpoint available")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hedged": self.hedged,
+                    "endpoints": [endpoint.to_dict() for endpoint in self.endpoints]}
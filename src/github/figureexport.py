@@ -0,0 +1,74 @@
+import logging
+import threading
+
+_server_lock = threading.Lock()
+_server_started = False
+
+
+def _browser_available() -> bool:
+    # kaleido's sync server thread dies silently without Chrome and every
+    # later export then blocks, so only start it when a browser is found
+    try:
+        from choreographer.browsers.chromium import Chromium
+
+        return Chromium.find_browser(skip_local=False) is not None
+    except Exception:
+        return False
+
+
+def ensure_export_server():
+    """Start kaleido's long-lived browser once per process.
+
+    Kaleido >= 1.0 otherwise launches Chrome for every write_image call.
+    Older kaleido (0.2.x) already keeps its scope subprocess alive, so there
+    is nothing to start.
+    """
+    global _server_started
+    if _server_started:
+        return
+    with _server_lock:
+        if _server_started:
+            return
+        try:
+            import kaleido
+
+            if hasattr(kaleido, "start_sync_server") and _browser_available():
+                # kaleido closes the server itself at interpreter exit
+                kaleido.start_sync_server(silence_warnings=True)
+        except Exception as e:
+            logging.warning(f"Persistent kaleido server unavailable: {e}")
+        _server_started = True
+
+
+def export_figures(figures: list, paths: list) -> list:
+    """Write many Plotly figures as images in one kaleido batch.
+
+    Returns one bool per figure.  If the batch fails, each figure is retried
+    on its own so one bad chart doesn't take the others down.
+    """
+    import plotly.io as pio
+
+    ensure_export_server()
+    if hasattr(pio, "write_images"):
+        try:
+            pio.write_images(figures, paths)
+            return [True] * len(figures)
+        except Exception as e:
+            logging.warning(f"Batch image export failed, exporting one by one: {e}")
+    results = []
+    for fig, path in zip(figures, paths):
+        try:
+            pio.write_image(fig, path)
+            results.append(True)
+        except Exception as e:
+            logging.error(f"Error saving image {path}: {e}")
+            results.append(False)
+    return results
+
+
+def export_figure(fig, path: str):
+    """Write one figure through the shared export server; raises on failure."""
+    import plotly.io as pio
+
+    ensure_export_server()
+    pio.write_image(fig, path)
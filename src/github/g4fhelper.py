@@ -4,12 +4,12 @@ import g4f
 from g4f.client import Client
 from g4f.Provider import BaseProvider
 import time
-import subprocess
 import plotly.figure_factory as ff
 import plotly.io as pio
 import base64
 from io import BytesIO
 import logging
+from commitlog import CommitRecord, iter_commits
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -46,27 +46,11 @@ class EnhancedBlogGenerator:
         except AttributeError:
             raise ValueError(f"Provider not found: {provider_name}")
 
-    def get_commit_history(self, repo_path: str) -> List[Dict]:
-        """Get repository commit history."""
+    def get_commit_history(self, repo_path: str, since: str = None,
+                           numstat: bool = False) -> List[CommitRecord]:
+        """Get repository commit history, oldest first."""
         try:
-            # Get git log with formatting
-            cmd = [
-                'git', '-C', repo_path, 'log', 
-                '--pretty=format:{%n  "hash": "%H",%n  "author": "%an",%n  "date": "%ai",%n  "message": "%s"%n}',
-                '--reverse'
-            ]
-            output = subprocess.check_output(cmd, universal_newlines=True)
-            
-            # Parse the JSON-like output
-            commits = []
-            for commit in output.strip().split('\n\n'):
-                try:
-                    commit_dict = eval(commit)
-                    commits.append(commit_dict)
-                except:
-                    continue
-                    
-            return commits
+            return list(iter_commits(repo_path, since=since, numstat=numstat))
         except Exception as e:
             print(f"Error getting commit history: {e}")
             return []
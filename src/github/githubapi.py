@@ -0,0 +1,175 @@
+import hashlib
+import logging
+
+import requests
+
+GITHUB_API_URL = "https://api.github.com"
+GRAPHQL_URL = "https://api.github.com/graphql"
+# Ask /readme for the file body itself instead of metadata + download_url
+RAW_MEDIA_TYPE = "application/vnd.github.raw+json"
+
+# GraphQL has no "the readme" lookup, so try the usual file names in order
+README_CANDIDATES = ("README.md", "readme.md", "Readme.md", "README.rst", "README.txt", "README")
+
+
+def git_blob_sha(content: bytes) -> str:
+    """Same sha GitHub reports for a blob, so raw downloads still carry it."""
+    header = f"blob {len(content)}\0".encode("utf-8")
+    return hashlib.sha1(header + content).hexdigest()
+
+
+def _readme_fields() -> str:
+    return " ".join(
+        f'f{position}: object(expression: "HEAD:{candidate}") {{ ... on Blob {{ text oid }} }}'
+        for position, candidate in enumerate(README_CANDIDATES)
+    )
+
+
+def _pick_readme(node: dict):
+    for position in range(len(README_CANDIDATES)):
+        blob = node.get(f"f{position}")
+        if blob and blob.get("text") is not None:
+            return blob["text"], blob.get("oid")
+    return None
+
+
+def _readme_batch_query(owner: str, names: list) -> str:
+    files = _readme_fields()
+    fields = [
+        f'r{index}: repository(owner: "{owner}", name: "{name}") {{ {files} }}'
+        for index, name in enumerate(names)
+    ]
+    return "query {\n" + "\n".join(fields) + "\n}"
+
+
+def fetch_readmes_batch(session, owner: str, names: list, headers: dict,
+                        batch_size: int = 50, graphql_url: str = GRAPHQL_URL) -> dict:
+    """Fetch READMEs for many repos with one GraphQL query per ``batch_size`` repos.
+
+    Returns ``{name: (text, sha)}`` for every repo whose README was found;
+    callers fall back to the REST endpoint for the rest.
+    """
+    readmes = {}
+    for start in range(0, len(names), batch_size):
+        batch = names[start:start + batch_size]
+        try:
+            response = session.post(
+                graphql_url,
+                json={"query": _readme_batch_query(owner, batch)},
+                headers=headers,
+                idempotent=True,
+            )
+        except requests.RequestException as e:
+            logging.warning(f"GraphQL readme batch failed: {e}")
+            continue
+        if response.status_code != 200:
+            logging.warning(
+                f"GraphQL readme batch failed with status {response.status_code}"
+            )
+            continue
+        data = response.json().get("data") or {}
+        for index, name in enumerate(batch):
+            readme = _pick_readme(data.get(f"r{index}") or {})
+            if readme is not None:
+                readmes[name] = readme
+    return readmes
+
+
+REPOSITORIES_QUERY = """
+query($login: String!, $cursor: String, $pageSize: Int!, $commits: Int!) {
+  repositoryOwner(login: $login) {
+    repositories(first: $pageSize, after: $cursor, ownerAffiliations: OWNER,
+                 privacy: PUBLIC, orderBy: {field: PUSHED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name description url stargazerCount forkCount isFork isPrivate pushedAt
+        %(readme_fields)s
+        defaultBranchRef {
+          target {
+            ... on Commit {
+              history(first: $commits) {
+                nodes { oid committedDate message author { name } }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def _graphql_commit_history(node: dict) -> list:
+    """Convert GraphQL history (newest first) to get_commit_history's oldest-first dicts."""
+    target = ((node.get("defaultBranchRef") or {}).get("target") or {})
+    history = (target.get("history") or {}).get("nodes") or []
+    commits = []
+    for commit in reversed(history):
+        # 2024-01-02T03:04:05Z -> 2024-01-02 03:04:05 +0000, the git %ai layout
+        date = (commit.get("committedDate") or "").replace("T", " ").rstrip("Z")
+        commits.append({
+            "hash": commit.get("oid"),
+            "author": (commit.get("author") or {}).get("name") or "unknown",
+            "date": f"{date} +0000",
+            "message": (commit.get("message") or "").split("\n", 1)[0],
+        })
+    return commits
+
+
+def fetch_repositories_graphql(session, login: str, headers: dict,
+                               pushed_after: str = None, page_size: int = 20,
+                               commits: int = 50, graphql_url: str = GRAPHQL_URL):
+    """List a user's repos with README and recent commits in a few paged queries.
+
+    Repos come back newest push first in the same shape as the REST listing
+    (``name``, ``html_url``, ``stargazers_count`` ...) plus ``readme`` as
+    ``(text, sha)`` and ``commits`` in get_commit_history format.  Paging stops
+    at the first repo pushed before ``pushed_after`` (ISO-8601, UTC).  Only
+    public repos are listed, like the REST ``/users/<login>/repos`` endpoint,
+    since every repo returned ends up in a published post.
+    Returns None when the API can't be used so callers can fall back to REST.
+    """
+    query = REPOSITORIES_QUERY % {"readme_fields": _readme_fields()}
+    repos = []
+    cursor = None
+    while True:
+        variables = {"login": login, "cursor": cursor,
+                     "pageSize": page_size, "commits": commits}
+        try:
+            response = session.post(
+                graphql_url, json={"query": query, "variables": variables},
+                headers=headers, idempotent=True,
+            )
+        except requests.RequestException as e:
+            logging.warning(f"GraphQL repository listing failed: {e}")
+            return None
+        payload = response.json() if response.status_code == 200 else {}
+        owner = (payload.get("data") or {}).get("repositoryOwner")
+        if not owner:
+            logging.warning(
+                f"GraphQL repository listing failed with status {response.status_code}: "
+                f"{payload.get('errors') or response.text[:200]}"
+            )
+            return None
+
+        connection = owner["repositories"]
+        for node in connection["nodes"]:
+            if pushed_after and node.get("pushedAt") and node["pushedAt"] < pushed_after:
+                return repos
+            if node.get("isPrivate"):
+                continue
+            repos.append({
+                "name": node["name"],
+                "html_url": node["url"],
+                "description": node.get("description"),
+                "stargazers_count": node.get("stargazerCount", 0),
+                "forks_count": node.get("forkCount", 0),
+                "fork": node.get("isFork", False),
+                "pushed_at": node.get("pushedAt"),
+                "readme": _pick_readme(node),
+                "commits": _graphql_commit_history(node),
+            })
+        if not connection["pageInfo"]["hasNextPage"]:
+            return repos
+        cursor = connection["pageInfo"]["endCursor"]
@@ -0,0 +1,92 @@
+"""Local stand-in for api.github.com/graphql that replays recorded responses.
+
+Record once against GitHub, then point ``github_graphql_url`` in config.yml at
+the replay server to exercise the GraphQL fetcher offline:
+
+    python src/github/graphql_replay.py record --recordings=graphql.json
+    python src/github/graphql_replay.py replay --recordings=graphql.json
+"""
+import hashlib
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fire import Fire
+
+from githubapi import GRAPHQL_URL
+from httpclient import get_http_client
+
+
+def request_key(body: dict) -> str:
+    """Recordings are matched on the query text plus its variables."""
+    payload = json.dumps(
+        [body.get("query", ""), body.get("variables") or {}], sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_recordings(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def make_handler(recordings: dict, path: str, upstream: str = None, token: str = None):
+    class GraphQLReplayHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            key = request_key(body)
+            if key not in recordings and upstream:
+                response = get_http_client().post(
+                    upstream, json=body,
+                    headers={"Authorization": f"bearer {token}"},
+                    idempotent=True,
+                )
+                recordings[key] = {"status": response.status_code, "body": response.json()}
+                with open(path, "w", encoding="utf-8") as file:
+                    json.dump(recordings, file, ensure_ascii=False, indent=2, sort_keys=True)
+
+            recorded = recordings.get(key)
+            if recorded is None:
+                status, payload = 404, {"errors": [{"message": f"no recording for {key}"}]}
+            else:
+                status, payload = recorded["status"], recorded["body"]
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            print("graphql replay:", format % args)
+
+    return GraphQLReplayHandler
+
+
+def make_server(recordings="graphql_recordings.json", port=8765, upstream=None, token=None):
+    """Replay server bound to localhost; port 0 picks a free one (see ``server_port``)."""
+    handler = make_handler(load_recordings(recordings), recordings, upstream, token)
+    return ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+
+def serve(recordings="graphql_recordings.json", port=8765, upstream=None, token=None):
+    server = make_server(recordings, port, upstream, token)
+    print(f"graphql replay listening on http://127.0.0.1:{server.server_port}/graphql")
+    server.serve_forever()
+
+
+def replay(recordings="graphql_recordings.json", port=8765):
+    serve(recordings=recordings, port=port)
+
+
+def record(recordings="graphql_recordings.json", port=8765):
+    # Unknown requests are forwarded to GitHub and saved for later replays
+    serve(recordings=recordings, port=port, upstream=GRAPHQL_URL,
+          token=os.getenv("GITHUB_TOKEN"))
+
+
+if __name__ == "__main__":
+    Fire({"replay": replay, "record": record})
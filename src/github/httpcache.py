@@ -0,0 +1,189 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, "../../"))
+
+DEFAULT_CACHE_PATH = os.path.join(project_root, ".cache", "http_cache.sqlite")
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class CachedResponse:
+    """Minimal stand-in for ``requests.Response`` built from a stored body."""
+
+    def __init__(self, url: str, body: bytes, headers: dict, status_code: int = 200):
+        self.url = url
+        self.content = body
+        self.headers = CaseInsensitiveDict(headers)
+        self.status_code = status_code
+        self.from_cache = True
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ConditionalHTTPCache:
+    """ETag / Last-Modified store that turns repeat GETs into conditional requests.
+
+    Every 200 response that carries a validator is stored per (url, Accept).
+    The next GET for the same key sends ``If-None-Match`` / ``If-Modified-Since``
+    and a 304 is answered from the stored body; GitHub doesn't count those
+    against the rate limit.  Entries unused for ``ttl_seconds`` are dropped,
+    and past ``max_entries`` the least recently used ones are evicted.
+    """
+
+    # Only these response headers are kept alongside the body
+    KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, session=None,
+                 ttl_seconds: int = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.session = session or requests
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.requests = 0
+        self.not_modified = 0
+        self.stored = 0
+        self.uncacheable = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " url TEXT NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " headers TEXT NOT NULL,"
+            " body BLOB NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(url: str, accept: str = None) -> str:
+        return hashlib.sha256(f"{accept or ''} {url}".encode("utf-8")).hexdigest()
+
+    def _load(self, key: str):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+    def _touch(self, key: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+
+    def _store(self, key: str, url: str, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            with self._lock:
+                self.uncacheable += 1
+            return
+        headers = {
+            name: response.headers[name]
+            for name in self.KEPT_HEADERS
+            if name in response.headers
+        }
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, url, etag, last_modified, headers, body, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, etag, last_modified, json.dumps(headers),
+                 response.content, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+            self.stored += 1
+
+    def _evict(self):
+        # Called with the lock held
+        if self.ttl_seconds:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE accessed_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+            self.evictions += max(cursor.rowcount, 0)
+        if not self.max_entries:
+            return
+        entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if entries <= self.max_entries:
+            return
+        cursor = self._conn.execute(
+            "DELETE FROM responses WHERE key IN"
+            " (SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+            (entries - self.max_entries,),
+        )
+        self.evictions += max(cursor.rowcount, 0)
+
+    def get(self, url: str, headers: dict = None, params: dict = None, **kwargs):
+        """GET ``url`` conditionally; returns a real or cached response object."""
+        headers = dict(headers or {})
+        full_url = requests.Request("GET", url, params=params).prepare().url
+        key = self.make_key(full_url, headers.get("Accept"))
+        cached = self._load(key)
+        if cached is not None:
+            etag, last_modified, _, _ = cached
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        with self._lock:
+            self.requests += 1
+        response = self.session.get(full_url, headers=headers, **kwargs)
+        if response.status_code == 304 and cached is not None:
+            with self._lock:
+                self.not_modified += 1
+            try:
+                self._touch(key)
+            except sqlite3.Error as e:
+                logging.warning(f"Could not update {full_url} in http cache: {e}")
+            return CachedResponse(full_url, cached[3], json.loads(cached[2]))
+        if response.status_code == 200:
+            try:
+                self._store(key, full_url, response)
+            except sqlite3.Error as e:
+                logging.warning(f"Could not store {full_url} in http cache: {e}")
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return {
+                "requests": self.requests,
+                "not_modified": self.not_modified,
+                "stored": self.stored,
+                "uncacheable": self.uncacheable,
+                "evictions": self.evictions,
+                "entries": entries,
+            }
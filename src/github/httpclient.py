@@ -0,0 +1,128 @@
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+# (connect, read) seconds; chat completions can take a while to come back
+DEFAULT_TIMEOUT = (10, 120)
+# Statuses worth another try: rate limiting and transient upstream errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Other methods may already have been acted on when a 5xx or a dropped
+# connection comes back, so they are only retried on 429 and on failures to
+# connect, where the request never reached the server
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def is_connect_error(error: Exception) -> bool:
+    """True when ``error`` happened before the request was sent."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, NewConnectionError)
+
+
+def retry_after_seconds(response) -> float:
+    """Seconds asked for by a ``Retry-After`` header (delta or HTTP date), else None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+class HTTPClient:
+    """Keep-alive ``requests`` session with timeouts and retries.
+
+    Connections are pooled per host, so every call site talking to the same
+    API reuses its sockets.  Connection errors and ``RETRY_STATUSES`` are
+    retried with exponential backoff plus jitter; a ``Retry-After`` header
+    takes precedence over the computed delay.  The last response (or
+    exception) is returned as-is, so callers keep their own status checks.
+    Non-idempotent methods are only retried on 429 and connect failures;
+    ``idempotent=True`` opts a POST with no side effects (a query, a chat
+    completion) into the full retry policy.
+    File-object bodies can't be replayed, so uploads should pass ``retries=0``.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries: int = 3, backoff: float = 1.0,
+                 max_backoff: float = 60.0, pool_connections: int = 16, pool_maxsize: int = 32):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        # Retries are handled in request(), not by urllib3
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _delay(self, attempt: int, response=None) -> float:
+        if response is not None:
+            requested = retry_after_seconds(response)
+            if requested is not None:
+                return min(requested, self.max_backoff)
+        delay = self.backoff * (2 ** attempt)
+        return min(delay + random.uniform(0, delay / 2), self.max_backoff)
+
+    def request(self, method: str, url: str, retries: int = None, timeout=None,
+                idempotent: bool = None, **kwargs) -> requests.Response:
+        method = method.upper()
+        idempotent = method in IDEMPOTENT_METHODS if idempotent is None else idempotent
+        retries = self.retries if retries is None else retries
+        timeout = self.timeout if timeout is None else timeout
+        for attempt in range(retries + 1):
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= retries or not (idempotent or is_connect_error(e)):
+                    raise
+                delay = self._delay(attempt)
+                logging.warning(f"{method} {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                retryable = response.status_code in RETRY_STATUSES and (idempotent or response.status_code == 429)
+                if not retryable or attempt >= retries:
+                    return response
+                delay = self._delay(attempt, response)
+                logging.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+                response.close()
+            time.sleep(delay)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, data=None, json=None, **kwargs) -> requests.Response:
+        return self.request("POST", url, data=data, json=json, **kwargs)
+
+
+_default_client = None
+_default_options = {}
+_default_lock = threading.Lock()
+
+
+def configure_http_client(**options):
+    """Set HTTPClient options (timeout, retries, backoff, ...) before first use."""
+    global _default_client, _default_options
+    with _default_lock:
+        _default_options = options
+        _default_client = None
+
+
+def get_http_client() -> HTTPClient:
+    """The process-wide HTTPClient every module sends its requests through."""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HTTPClient(**_default_options)
+        return _default_client
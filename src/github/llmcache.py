@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, "../../"))
+
+DEFAULT_CACHE_PATH = os.path.join(project_root, ".cache", "llm_cache.sqlite")
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class LLMCache:
+    """Persistent chat-completion cache keyed by hash(model, prompt, temperature, max_tokens).
+
+    Entries live in a small SQLite file.  Reads older than ``ttl_seconds`` are
+    treated as misses, and once the stored responses exceed ``max_bytes`` the
+    least recently used ones are evicted.  Callers that parse the reply pass
+    ``validate`` to get_or_call so an unusable reply is neither stored nor
+    served again.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH,
+                 ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature=None, max_tokens=None) -> str:
+        payload = json.dumps([model, prompt, temperature, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, prompt: str, temperature=None, max_tokens=None):
+        key = self.make_key(model, prompt, temperature, max_tokens)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl_seconds and now - row[1] > self.ttl_seconds):
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, model: str, prompt: str, temperature, response: str, max_tokens=None):
+        if not response:
+            # Never remember failures, the next run should retry them
+            return
+        key = self.make_key(model, prompt, temperature, max_tokens)
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses"
+                " (key, response, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, model: str, prompt: str, temperature=None, max_tokens=None):
+        key = self.make_key(model, prompt, temperature, max_tokens)
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def _evict(self):
+        if self.ttl_seconds:
+            cursor = self._conn.execute(
+                "DELETE FROM responses WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,),
+            )
+            self.evictions += max(cursor.rowcount, 0)
+        if not self.max_bytes:
+            return
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at ASC"
+        ).fetchall()
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+    def get_or_call(self, model: str, prompt: str, temperature, call,
+                    max_tokens=None, validate=None):
+        """Return the cached response, or run ``call()`` and store its result.
+
+        ``validate(response) -> bool`` keeps replies the caller can't use out
+        of the cache; a cached one that fails it is dropped and fetched again.
+        """
+        cached = self.get(model, prompt, temperature, max_tokens)
+        if cached is not None:
+            if validate is None or validate(cached):
+                return cached
+            self.delete(model, prompt, temperature, max_tokens)
+        response = call()
+        if isinstance(response, str) and (validate is None or validate(response)):
+            self.set(model, prompt, temperature, response, max_tokens)
+        return response
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+_default_cache = None
+_default_settings = {"enabled": True}
+_default_lock = threading.Lock()
+
+
+def configure_default_cache(enabled: bool = True, path: str = None,
+                            ttl_seconds: int = None, max_bytes: int = None):
+    """Set up the cache shared by every module, usually from config.yml."""
+    global _default_cache
+    _default_settings.update(
+        enabled=enabled,
+        path=path or DEFAULT_CACHE_PATH,
+        ttl_seconds=DEFAULT_TTL_SECONDS if ttl_seconds is None else ttl_seconds,
+        max_bytes=DEFAULT_MAX_BYTES if max_bytes is None else max_bytes,
+    )
+    _default_cache = None
+
+
+def get_default_cache():
+    """Return the shared LLMCache, or None when caching is disabled."""
+    global _default_cache
+    if not _default_settings.get("enabled", True):
+        return None
+    with _default_lock:
+        if _default_cache is not None:
+            return _default_cache
+        try:
+            _default_cache = LLMCache(
+                path=_default_settings.get("path", DEFAULT_CACHE_PATH),
+                ttl_seconds=_default_settings.get("ttl_seconds", DEFAULT_TTL_SECONDS),
+                max_bytes=_default_settings.get("max_bytes", DEFAULT_MAX_BYTES),
+            )
+        except sqlite3.Error as e:
+            logging.error(f"LLM cache unavailable, continuing without it: {e}")
+            _default_settings["enabled"] = False
+        return _default_cache
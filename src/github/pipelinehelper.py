@@ -0,0 +1,70 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_STAGE_LIMITS = {
+    "readme": 8,
+    "blog": 4,
+    "image": 2,
+    "tags": 4,
+}
+
+
+class RepoPipeline:
+    """Run blocking per-repo stages on a thread pool with bounded concurrency.
+
+    ``workers`` caps how many repos are in flight at once, and every stage
+    (readme fetch, blog generation, cover image, tag extraction) has its own
+    semaphore so a slow endpoint can't starve the others.  Semaphores are
+    created lazily inside the running loop to stay compatible with Python 3.8.
+    """
+
+    def __init__(self, workers: int = 4, stage_limits: dict = None):
+        self.workers = max(1, int(workers or 1))
+        self.stage_limits = dict(DEFAULT_STAGE_LIMITS)
+        self.stage_limits.update(stage_limits or {})
+        max_threads = max(self.workers, sum(self.stage_limits.values()))
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix="repo-pipeline"
+        )
+        self._repo_semaphore = None
+        self._stage_semaphores = {}
+
+    def _stage_semaphore(self, stage: str) -> asyncio.Semaphore:
+        if stage not in self._stage_semaphores:
+            limit = max(1, int(self.stage_limits.get(stage, self.workers)))
+            self._stage_semaphores[stage] = asyncio.Semaphore(limit)
+        return self._stage_semaphores[stage]
+
+    async def run(self, stage: str, func, *args, **kwargs):
+        """Run a blocking ``func`` in the pool under the ``stage`` limit."""
+        async with self._stage_semaphore(stage):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def map(self, coro_func, items):
+        """Apply ``coro_func`` to every item, at most ``workers`` at a time.
+
+        Results come back in input order; a failing item yields its exception
+        instead of cancelling the rest of the batch.
+        """
+        if self._repo_semaphore is None:
+            self._repo_semaphore = asyncio.Semaphore(self.workers)
+
+        async def bounded(item):
+            async with self._repo_semaphore:
+                return await coro_func(item)
+
+        results = await asyncio.gather(
+            *(bounded(item) for item in items), return_exceptions=True
+        )
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                logging.error(f"Pipeline item {index} failed: {result}")
+        return results
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,142 @@
+import math
+import re
+
+# Rough size of English/markdown text in BPE tokens; close enough for a
+# budget, and needs no tokenizer for whichever model the proxy picks
+CHARS_PER_TOKEN = 4
+# Code blocks longer than this keep their first lines only
+MAX_CODE_LINES = 12
+
+HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+HTML_TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>")
+IMAGE_RE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+LINK_RE = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+HEADING_RE = re.compile(r"^#{1,6}\s")
+SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """Cut ``text`` to about ``max_tokens``, at a sentence or word boundary when possible."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    limit = max(0, max_tokens * CHARS_PER_TOKEN - 1)
+    head = text[:limit]
+    sentences = SENTENCE_END_RE.split(head)
+    if len(sentences) > 1 and len(head) - len(sentences[-1]) > limit // 2:
+        head = head[: len(head) - len(sentences[-1])]
+    elif " " in head[limit // 2:]:
+        head = head[: head.rfind(" ")]
+    return head.rstrip() + "…"
+
+
+def clean_readme(readme: str) -> str:
+    """Drop what costs tokens but tells a model nothing: badges, images, HTML
+    markup and link targets; long code blocks keep their first lines."""
+    text = HTML_COMMENT_RE.sub("", readme or "")
+    lines, code_lines, in_code = [], 0, False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            if in_code and code_lines > MAX_CODE_LINES:
+                lines.append("...")
+            in_code, code_lines = not in_code, 0
+            lines.append(stripped)
+            continue
+        if in_code:
+            code_lines += 1
+            if code_lines <= MAX_CODE_LINES:
+                lines.append(line.rstrip())
+            continue
+        line = LINK_RE.sub(r"\1", IMAGE_RE.sub("", HTML_TAG_RE.sub("", line))).rstrip()
+        if line.strip() or (lines and lines[-1]):
+            lines.append(line)
+    if in_code:
+        lines.append("```")
+    return "\n".join(lines).strip()
+
+
+def split_sections(text: str) -> list:
+    """``[(heading, body)]`` at markdown headings; the text before the first has heading ''."""
+    sections, heading, body, in_code = [], "", [], False
+    for line in text.splitlines():
+        if line.startswith("```"):
+            in_code = not in_code
+        if not in_code and HEADING_RE.match(line):
+            sections.append((heading, "\n".join(body).strip()))
+            heading, body = line.strip(), []
+        else:
+            body.append(line)
+    sections.append((heading, "\n".join(body).strip()))
+    return [(heading, body) for heading, body in sections if heading or body]
+
+
+def _truncate_body(body: str, max_tokens: int) -> str:
+    if estimate_tokens(body) <= max_tokens:
+        return body
+    # Whole paragraphs while they fit, then part of the next one
+    kept, used = [], 0
+    for paragraph in body.split("\n\n"):
+        cost = estimate_tokens(paragraph) + 1
+        if used + cost > max_tokens:
+            remaining = max_tokens - used
+            # A cut code block would leave an unclosed fence
+            if remaining >= 16 and not paragraph.lstrip().startswith("```"):
+                kept.append(truncate_text(paragraph, remaining))
+            break
+        kept.append(paragraph)
+        used += cost
+    return "\n\n".join(kept)
+
+
+def condense_readme(readme: str, max_tokens: int) -> str:
+    """Fit a README into ``max_tokens``.
+
+    After cleaning, a README over budget keeps every heading it can afford
+    (the outline says what the project covers) and shares the rest of the
+    budget fairly between sections: short sections stay whole and what they
+    leave over goes to the longer ones, which are cut at paragraph or
+    sentence boundaries.
+    """
+    text = clean_readme(readme)
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    sections = split_sections(text)
+    # Later headings are dropped first when even the outline doesn't fit
+    while sections and sum(estimate_tokens(heading) + 1 for heading, _ in sections) > max_tokens // 2:
+        sections.pop()
+    if not sections:
+        return truncate_text(text, max_tokens)
+
+    remaining = max_tokens - sum(estimate_tokens(heading) + 1 for heading, _ in sections)
+    allowance = {}
+    by_size = sorted(range(len(sections)), key=lambda i: estimate_tokens(sections[i][1]))
+    for position, index in enumerate(by_size):
+        share = remaining // (len(by_size) - position)
+        allowance[index] = min(estimate_tokens(sections[index][1]) + 1, share)
+        remaining -= allowance[index]
+
+    parts = []
+    for index, (heading, body) in enumerate(sections):
+        body = _truncate_body(body, allowance[index])
+        parts.append("\n\n".join(part for part in (heading, body) if part))
+    return "\n\n".join(parts)
+
+
+class ReadmeContext:
+    """A README condensed once per post and shared by all of its prompts.
+
+    ``text`` fits ``max_tokens`` and is what the section prompts embed;
+    ``excerpt`` is its first ``excerpt_tokens`` for the short title and
+    introduction prompts.
+    """
+
+    def __init__(self, readme: str, max_tokens: int = 1500, excerpt_tokens: int = 125):
+        readme = readme or ""
+        self.source_tokens = estimate_tokens(readme)
+        self.text = condense_readme(readme, max_tokens)
+        self.tokens = estimate_tokens(self.text)
+        self.excerpt = truncate_text(self.text, excerpt_tokens)
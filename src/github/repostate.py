@@ -0,0 +1,86 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+
+def compute_inputs_hash(repo_name: str, description: str, readme_content: str) -> str:
+    """Hash everything a generated post is derived from."""
+    payload = json.dumps(
+        [repo_name, description or "", readme_content or ""], ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RepoStateLedger:
+    """JSON-lines record of what each repo looked like when its post was generated.
+
+    One line per repo with ``name``, ``pushed_at``, ``readme_sha`` and
+    ``inputs_hash``.  The file is rewritten sorted by name so it diffs cleanly
+    when the workflow commits it next to the posts.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    self.records[record["name"]] = record
+                except (ValueError, KeyError) as e:
+                    logging.warning(
+                        f"Ignoring bad line {line_number} in {self.path}: {e}"
+                    )
+
+    def get(self, name: str):
+        return self.records.get(name)
+
+    def is_listing_unchanged(self, repo: dict) -> bool:
+        """True when the repo hasn't been pushed since its post was generated."""
+        record = self.records.get(repo["name"])
+        return record is not None and record.get("pushed_at") == repo.get("pushed_at")
+
+    def is_content_unchanged(self, name: str, inputs_hash: str) -> bool:
+        record = self.records.get(name)
+        return record is not None and record.get("inputs_hash") == inputs_hash
+
+    def record(self, name: str, pushed_at: str, readme_sha: str = None,
+               inputs_hash: str = None):
+        new = {
+            "name": name,
+            "pushed_at": pushed_at,
+            "readme_sha": readme_sha,
+            "inputs_hash": inputs_hash,
+        }
+        if self.records.get(name) != new:
+            self.records[name] = new
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                for name in sorted(self.records):
+                    file.write(json.dumps(self.records[name], ensure_ascii=False, sort_keys=True))
+                    file.write("\n")
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._dirty = False
@@ -0,0 +1,203 @@
+"""Analytics charts written straight to SVG from a CommitColumns store.
+
+Needs nothing beyond NumPy, so it avoids the matplotlib/plotly/kaleido stack
+and produces a few kilobytes of vector markup instead of 300 dpi PNGs.
+"""
+import calendar
+import logging
+import math
+import os
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+from commitlog import CommitColumns
+
+# Colours follow the mplcyberpunk theme used by the PNG charts
+BACKGROUND = "#212946"
+FOREGROUND = "#d0d6f2"
+GRID = "#2a3459"
+ACCENT = "#08f7fe"
+HEAT_COLORS = ("#2a3459", "#ffeda0", "#feb24c", "#fc4e2a", "#bd0026")
+FONT = "font-family='Helvetica, Arial, sans-serif' font-size='10'"
+
+# kind -> file name suffix, the same names the PNG backend writes
+SVG_CHARTS = {
+    "heatmap": "commit_heatmap",
+    "network": "contribution_network",
+    "activity": "commit_activity",
+    "frequency": "code_frequency",
+    "timeline": "timeline_chart",
+}
+
+
+def _document(width: float, height: float, title: str, body: list) -> str:
+    return "\n".join([
+        f"<svg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 {width:.0f} {height:.0f}' "
+        f"width='{width:.0f}' height='{height:.0f}' role='img'>",
+        f"<title>{escape(title)}</title>",
+        f"<rect width='100%' height='100%' fill='{BACKGROUND}'/>",
+        f"<text x='{width / 2:.0f}' y='18' fill='{FOREGROUND}' text-anchor='middle' "
+        f"font-family='Helvetica, Arial, sans-serif' font-size='13'>{escape(title)}</text>",
+        *body,
+        "</svg>",
+    ])
+
+
+def _text(x: float, y: float, value: str, anchor: str = "start") -> str:
+    return (f"<text x='{x:.1f}' y='{y:.1f}' fill='{FOREGROUND}' text-anchor='{anchor}' "
+            f"{FONT}>{escape(str(value))}</text>")
+
+
+def _heat_color(value: int, top: int) -> str:
+    if value <= 0 or top <= 0:
+        return HEAT_COLORS[0]
+    step = math.ceil(value / top * (len(HEAT_COLORS) - 1))
+    return HEAT_COLORS[min(step, len(HEAT_COLORS) - 1)]
+
+
+def _cells(grid, x0: float, y0: float, size: float, gap: float, labels=None) -> list:
+    """Rects for a 2-D count grid; ``labels(row, col)`` names each cell in its tooltip."""
+    top = int(grid.max()) if grid.size else 0
+    body = []
+    for row in range(grid.shape[0]):
+        for col in range(grid.shape[1]):
+            value = int(grid[row, col])
+            tip = f"{labels(row, col)}: {value}" if labels else str(value)
+            body.append(
+                f"<rect x='{x0 + col * (size + gap):.1f}' y='{y0 + row * (size + gap):.1f}' "
+                f"width='{size}' height='{size}' rx='2' fill='{_heat_color(value, top)}'>"
+                f"<title>{escape(tip)}</title></rect>"
+            )
+    return body
+
+
+def heatmap_svg(columns: CommitColumns, start=None, end=None) -> str:
+    """GitHub-style calendar of commits per day."""
+    grid, week_starts = columns.calendar_grid(start=start, end=end)
+    size, gap, left, top = 11, 2, 34, 44
+    width = left + grid.shape[1] * (size + gap) + 10
+    height = top + 7 * (size + gap) + 10
+    body = []
+    months = week_starts.astype("datetime64[M]")
+    for col in np.flatnonzero(np.r_[True, months[1:] != months[:-1]]):
+        month = months[col].astype(object)
+        body.append(_text(left + col * (size + gap), top - 6, f"{calendar.month_abbr[month.month]} {month.year}"))
+    for row in (0, 2, 4):
+        body.append(_text(left - 6, top + row * (size + gap) + size - 2, calendar.day_abbr[row], "end"))
+
+    def label(row, col):
+        return str(week_starts[col] + np.timedelta64(row, "D"))
+
+    body.extend(_cells(grid, left, top, size, gap, label))
+    return _document(width, height, "Commit Activity Heatmap", body)
+
+
+def activity_svg(columns: CommitColumns) -> str:
+    """Commits per weekday and hour of day."""
+    grid = np.bincount(columns.weekdays * 24 + columns.hours, minlength=7 * 24).reshape(7, 24)
+    size, gap, left, top = 18, 2, 70, 32
+    width = left + 24 * (size + gap) + 10
+    height = top + 7 * (size + gap) + 22
+    body = [_text(left - 6, top + row * (size + gap) + size - 5, calendar.day_name[row], "end")
+            for row in range(7)]
+    body.extend(_text(left + hour * (size + gap) + size / 2, height - 8, f"{hour:02d}", "middle")
+                for hour in range(0, 24, 3))
+    body.extend(_cells(grid, left, top, size, gap,
+                       lambda row, col: f"{calendar.day_name[row]} {col:02d}:00"))
+    return _document(width, height, "Commit Activity by Day and Hour", body)
+
+
+def _time_axis(first, last, left: float, right: float, baseline: float) -> list:
+    body = [f"<line x1='{left}' y1='{baseline}' x2='{right}' y2='{baseline}' stroke='{GRID}'/>"]
+    body.append(_text(left, baseline + 14, str(first)))
+    if last != first:
+        body.append(_text(right, baseline + 14, str(last), "end"))
+    return body
+
+
+def frequency_svg(columns: CommitColumns, width: int = 720, height: int = 240) -> str:
+    """Commits per day as a filled line."""
+    days, counts = np.unique(columns.days, return_counts=True)
+    left, right, top, baseline = 40, width - 12, 32, height - 24
+    body = _time_axis(days[0], days[-1], left, right, baseline)
+    span = max(int((days[-1] - days[0]).astype(np.int64)), 1)
+    xs = left + (days - days[0]).astype(np.int64) / span * (right - left)
+    ys = baseline - counts / counts.max() * (baseline - top)
+    points = " ".join(f"{x:.1f},{y:.1f}" for x, y in zip(xs, ys))
+    body.append(_text(left - 6, top + 4, int(counts.max()), "end"))
+    body.append(_text(left - 6, baseline, 0, "end"))
+    body.append(f"<polygon points='{xs[0]:.1f},{baseline} {points} {xs[-1]:.1f},{baseline}' "
+                f"fill='{ACCENT}' fill-opacity='0.2'/>")
+    body.append(f"<polyline points='{points}' fill='none' stroke='{ACCENT}' stroke-width='1.5'/>")
+    return _document(width, height, "Code Frequency Over Time", body)
+
+
+def timeline_svg(columns: CommitColumns, width: int = 720, height: int = 120) -> str:
+    """One mark per commit day along a time axis; hover shows that day's first message."""
+    days, first_index, counts = np.unique(columns.days, return_index=True, return_counts=True)
+    left, right, baseline = 20, width - 20, height - 30
+    body = _time_axis(days[0], days[-1], left, right, baseline)
+    span = max(int((days[-1] - days[0]).astype(np.int64)), 1)
+    xs = left + (days - days[0]).astype(np.int64) / span * (right - left)
+    radius = 2 + 6 * np.sqrt(counts / counts.max())
+    for x, r, day, index, count in zip(xs, radius, days, first_index, counts):
+        message = columns.message(index)
+        message = message[:30] + '...' if len(message) > 30 else message
+        tip = f"{day}: {count} commit{'s' if count != 1 else ''} - {message}"
+        body.append(f"<circle cx='{x:.1f}' cy='{baseline - 20}' r='{r:.1f}' fill='{ACCENT}' "
+                    f"fill-opacity='0.6'><title>{escape(tip)}</title></circle>")
+    return _document(width, height, "Commit Timeline", body)
+
+
+def network_svg(columns: CommitColumns, max_authors: int = 40, max_edges: int = 120,
+                size: int = 520) -> str:
+    """Contributor hand-off graph on a circle, busiest author first."""
+    commit_counts, top_authors, edges, weights = columns.contributor_graph(max_authors, max_edges)
+    center, ring = size / 2, size / 2 - 70
+    angles = -math.pi / 2 + 2 * math.pi * np.arange(len(top_authors)) / max(len(top_authors), 1)
+    position = {int(code): (center + ring * math.cos(a), center + 10 + ring * math.sin(a))
+                for code, a in zip(top_authors, angles)}
+    body = []
+    max_weight = int(weights[0]) if len(weights) else 1
+    for (code1, code2), weight in zip(edges, weights):
+        (x1, y1), (x2, y2) = position[int(code1)], position[int(code2)]
+        body.append(f"<line x1='{x1:.1f}' y1='{y1:.1f}' x2='{x2:.1f}' y2='{y2:.1f}' stroke='{FOREGROUND}' "
+                    f"stroke-opacity='0.6' stroke-width='{0.5 + 5.5 * weight / max_weight:.1f}'/>")
+    max_commits = int(commit_counts.max()) if len(commit_counts) else 1
+    for code, (x, y) in position.items():
+        author = columns.authors[code]
+        radius = 4 + 12 * math.sqrt(commit_counts[code] / max_commits)
+        body.append(f"<circle cx='{x:.1f}' cy='{y:.1f}' r='{radius:.1f}' fill='{ACCENT}'>"
+                    f"<title>{escape(f'{author}: {commit_counts[code]} commits')}</title></circle>")
+        body.append(_text(x, y + radius + 11, author, "middle"))
+    return _document(size, size + 20, "Contributor Network", body)
+
+
+def write_svg_charts(commits, repo_name: str, assets_save_folder: str,
+                     assets_read_folder: str, kinds=None,
+                     max_authors: int = 40, max_edges: int = 120) -> dict:
+    """Write the requested charts as SVG; returns ``{kind: read path}``, '' on failure."""
+    columns = CommitColumns.from_commits(commits)
+    builders = {
+        "heatmap": lambda: heatmap_svg(columns),
+        "network": lambda: network_svg(columns, max_authors=max_authors, max_edges=max_edges),
+        "activity": lambda: activity_svg(columns),
+        "frequency": lambda: frequency_svg(columns),
+        "timeline": lambda: timeline_svg(columns),
+    }
+    os.makedirs(assets_save_folder, exist_ok=True)
+    paths = {}
+    for kind in (kinds or SVG_CHARTS):
+        file_name = f"{repo_name}-{SVG_CHARTS[kind]}.svg"
+        try:
+            if not len(columns):
+                raise ValueError("no commits")
+            svg = builders[kind]()
+            with open(os.path.join(assets_save_folder, file_name), "w", encoding="utf-8") as file:
+                file.write(svg)
+            paths[kind] = os.path.join(assets_read_folder, file_name)
+        except Exception as e:
+            logging.error(f"Error generating {kind} SVG chart: {e}")
+            paths[kind] = ""
+    return paths
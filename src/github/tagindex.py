@@ -0,0 +1,82 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+
+
+class TagIndex:
+    """Blog tag list kept in memory for a whole run and written once.
+
+    ``tags.json`` holds the sorted tag list the site reads, the number of
+    posts per tag, and each post's tags so a regenerated post replaces its
+    old tags instead of counting them twice.  Tags from older files that
+    predate ``posts`` are kept with a count of 0 until a post uses them.
+    Tags read from the file are kept verbatim, since the site matches them
+    case-sensitively against post frontmatter; ``normalize`` only applies
+    to tags passed to add().
+    """
+
+    def __init__(self, path: str, normalize=None):
+        self.path = path
+        # list of raw tags -> list of cleaned tags
+        self.normalize = normalize or (lambda tags: [tag.strip() for tag in tags if tag.strip()])
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.legacy_tags = set()
+        self.posts = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                self.posts = {
+                    post: sorted(set(tags))
+                    for post, tags in (data.get("posts") or {}).items()
+                }
+                self.legacy_tags = set(data.get("tags") or [])
+            except (ValueError, OSError, AttributeError) as e:
+                logging.warning(f"Ignoring unreadable tag index {path}: {e}")
+
+    def add(self, post: str, tags):
+        """Set the tags of ``post``; returns them normalized."""
+        tags = sorted(set(self.normalize(tags or [])))
+        with self._lock:
+            if self.posts.get(post) != tags:
+                self.posts[post] = tags
+                self._dirty = True
+        return tags
+
+    def counts(self) -> dict:
+        with self._lock:
+            counts = dict.fromkeys(self.legacy_tags, 0)
+            for tags in self.posts.values():
+                for tag in tags:
+                    counts[tag] = counts.get(tag, 0) + 1
+        return counts
+
+    def to_dict(self) -> dict:
+        counts = self.counts()
+        with self._lock:
+            posts = {post: self.posts[post] for post in sorted(self.posts)}
+        return {
+            "tags": sorted(counts),
+            "counts": {tag: counts[tag] for tag in sorted(counts)},
+            "posts": posts,
+        }
+
+    def save(self):
+        """Write the index atomically; a no-op when nothing changed."""
+        if not self._dirty and os.path.exists(self.path):
+            return
+        data = self.to_dict()
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+            file.write("\n")
+        # mkstemp creates 0600; tags.json is served by the site build
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, self.path)
+        with self._lock:
+            self._dirty = False
@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 import tweepy
 import requests
@@ -6,6 +7,10 @@ from pydash import py_
 from datetime import datetime
 from image_maker import image_maker_make_file
 
+# The shared HTTP client lives with the blog tooling in src/github
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "github"))
+from httpclient import get_http_client
+
 
 FB_PAGE_ID = os.environ.get('FB_PAGE_ID')
 FB_OAUTH_TOKEN = os.environ.get('FB_OAUTH_TOKEN')
@@ -46,7 +51,8 @@ def post_to_telegram_as_text(text: str) -> bool:
         tg_url = f"https://api.telegram.org/bot{TG_BOT_TOKEN}/sendMessage?"
         tg_url += f"text={requests.utils.quote(text)}"
         tg_url += f"&chat_id={TG_BOT_CHANNEL}"
-        response = requests.get(tg_url)
+        # sendMessage posts even though it is a GET, so it must not be repeated
+        response = get_http_client().get(tg_url, retries=0)
         success = response.status_code == 200
         if not success:
             print(">>> error: failed to post")
@@ -60,10 +66,11 @@ def post_to_telegram_as_image(image_path: str) -> bool:
     print("\n>>> telegram: posting as image...")
     try:
         tg_url = f"https://api.telegram.org/bot{TG_BOT_TOKEN}/sendPhoto"
-        response = requests.post(
+        response = get_http_client().post(
             url=tg_url,
             data={'chat_id': TG_BOT_CHANNEL},
-            files={'photo': open(image_path, 'rb')}
+            files={'photo': open(image_path, 'rb')},
+            retries=0,
         )
         success = response.status_code == 200
         if not success:
@@ -78,10 +85,10 @@ def post_to_facebook_as_text(text: str) -> bool:
     print("\n>>> facebook: posting as text...")
     try:
         fb_url = f"https://graph.facebook.com/{FB_PAGE_ID}/feed"
-        response = requests.post(fb_url, {
+        response = get_http_client().post(fb_url, {
             'message': text,
             'access_token': FB_OAUTH_TOKEN,
-        })
+        }, retries=0)
         success = response.status_code == 200
         if not success:
             print(">>> error: failed to post")
@@ -95,10 +102,11 @@ def post_to_facebook_as_image(image_path: str) -> bool:
     print("\n>>> facebook: posting as image...")
     try:
         fb_url = f"https://graph.facebook.com/{FB_PAGE_ID}/photos"
-        response = requests.post(
+        response = get_http_client().post(
             url=fb_url,
             data={'access_token': FB_OAUTH_TOKEN},
-            files={'source': open(image_path, 'rb')}
+            files={'source': open(image_path, 'rb')},
+            retries=0,
         )
         success = response.status_code == 200
         if not success:
@@ -145,7 +153,7 @@ def post_to_instagram(image_path: str) -> bool:
     print("\n>>> instagram: posting...")
     try:
         files = {'file': open(image_path, 'rb')}
-        image_uploaded = requests.post('https://tmpfiles.org/api/v1/upload', files=files)
+        image_uploaded = get_http_client().post('https://tmpfiles.org/api/v1/upload', files=files, retries=0)
         if image_uploaded.status_code != 200:
             print(">>> error: failed to upload to tmpfiles.org")
             print(f">>> response: {image_uploaded.text}")
@@ -154,20 +162,20 @@ def post_to_instagram(image_path: str) -> bool:
         image_url = image_url[:21] + 'dl/' + image_url[21:]
         ig_base_url = f"https://graph.facebook.com/v18.0/{IG_ACCOUNT_ID}"
         caption = '#quotes_idna #quotesindonesia #qotdindonesia #katakatabijak #katatokoh #kutipan #motivasi #inspirasi'
-        response_post = requests.post(f"{ig_base_url}/media", {
+        response_post = get_http_client().post(f"{ig_base_url}/media", {
             'image_url': image_url,
             'caption': caption,
             'access_token': IG_OAUTH_TOKEN,
-        })
+        }, retries=0)
         if response_post.status_code != 200:
             print(">>> error: failed to create post")
             print(f">>> response: {response_post.text}")
             return False
         creation_id = response_post.json()['id']
-        response_publish = requests.post(f"{ig_base_url}/media_publish", {
+        response_publish = get_http_client().post(f"{ig_base_url}/media_publish", {
             'creation_id': creation_id,
             'access_token': IG_OAUTH_TOKEN,
-        })
+        }, retries=0)
         success_publish = response_publish.status_code == 200
         if not success_publish:
             print(">>> error: failed to publish post")
@@ -0,0 +1,65 @@
+import os
+import subprocess
+
+import pytest
+
+from commitlog import iter_commits
+
+
+def git(repo, *args, date=None):
+    env = dict(os.environ, GIT_AUTHOR_NAME="Octo Dev", GIT_AUTHOR_EMAIL="octo@example.com",
+               GIT_COMMITTER_NAME="Octo Dev", GIT_COMMITTER_EMAIL="octo@example.com")
+    if date:
+        env.update(GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+    subprocess.run(["git", "-C", repo, *args], check=True, env=env,
+                   stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def commit(repo, files, message, date):
+    for name, content in files.items():
+        mode = "wb" if isinstance(content, bytes) else "w"
+        with open(os.path.join(repo, name), mode) as file:
+            file.write(content)
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", message, date=date)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = str(tmp_path)
+    git(path, "init", "-q")
+    commit(path, {"notes.txt": "one\ntwo\nthree\n"},
+           "Add \"notes\" with 'quotes', {braces} and a \x1f field mark",
+           "2020-03-01T10:00:00+0000")
+    commit(path, {"notes.txt": "one\n2\nthree\n", "logo.bin": b"\x00\x01\x02"},
+           "Subject line\n\nBody that\nspans lines.",
+           "2024-05-02T11:30:00+0200")
+    commit(path, {"notes.txt": "one\n2\nthree\nfour\nfive\n"},
+           "Two line\nsubject", "2024-05-03T09:00:00+0000")
+    return path
+
+
+def test_fields_survive_quotes_delimiters_and_newlines(repo):
+    commits = list(iter_commits(repo))
+
+    assert [c.message for c in commits] == [
+        "Add \"notes\" with 'quotes', {braces} and a \x1f field mark",
+        "Subject line",
+        "Two line subject",
+    ]
+    assert {c.author for c in commits} == {"Octo Dev"}
+    assert commits[1].date == "2024-05-02 11:30:00 +0200"
+    assert all(len(c.hash) == 40 for c in commits)
+    assert commits[0]["date"] == commits[0].date
+
+
+def test_numstat_totals(repo):
+    commits = list(iter_commits(repo, numstat=True))
+    # Binary files count as neither additions nor deletions
+    assert [(c.additions, c.deletions) for c in commits] == [(3, 0), (1, 1), (2, 0)]
+    assert all(c.additions == 0 for c in iter_commits(repo))
+
+
+def test_since_filters_older_commits(repo):
+    commits = list(iter_commits(repo, since="2024-01-01"))
+    assert [c.message for c in commits] == ["Subject line", "Two line subject"]
@@ -0,0 +1,30 @@
+import os
+import stat
+
+from coverqueue import CoverImageQueue, split_frontmatter, write_post
+
+
+def read_post(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return split_frontmatter(file.read())
+
+
+def test_finish_patches_cover_and_keeps_post_readable(tmp_path):
+    md_path = os.path.join(tmp_path, "astro-notes.md")
+    write_post(md_path, {"title": "Astro notes", "cover": {"url": "placeholder.png"}},
+               "\n\nBody text.\n")
+
+    covers = CoverImageQueue(lambda prompt: f"https://img.example/{prompt}.png")
+    covers.submit("astro-notes", "notes")
+    covers.submit("dotfiles", "dots")
+    covers.attach("astro-notes", md_path)
+
+    assert covers.finish() == {
+        "astro-notes": "https://img.example/notes.png",
+        "dotfiles": "https://img.example/dots.png",
+    }
+    frontmatter, body = read_post(md_path)
+    assert frontmatter["cover"] == {"url": "https://img.example/notes.png",
+                                    "square": "https://img.example/notes.png"}
+    assert body == "\n\nBody text.\n"
+    assert stat.S_IMODE(os.stat(md_path).st_mode) == 0o644
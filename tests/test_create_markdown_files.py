@@ -0,0 +1,43 @@
+import asyncio
+import datetime
+import os
+
+import pytest
+
+daily = pytest.importorskip("daily_github_appleblog")
+
+
+def test_posts_are_written_as_each_repo_finishes(tmp_path, monkeypatch):
+    pushed_at = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    repos = [{"name": name, "pushed_at": pushed_at, "readme": None}
+             for name in ("slow", "fast")]
+    fast_post = os.path.join(tmp_path, "fast.md")
+    seen = {}
+
+    async def build_repo_post(repo, *args, default_images=None, **kwargs):
+        if repo["name"] == "slow":
+            # Finishes only once the other repo's post is already on disk
+            for _ in range(200):
+                if os.path.exists(fast_post):
+                    break
+                await asyncio.sleep(0.01)
+            seen["fast_post_before_slow_done"] = os.path.exists(fast_post)
+        seen["default_images"] = default_images
+        return {"repo_name": repo["name"], "pushed_at": repo["pushed_at"],
+                "readme_sha": None, "inputs_hash": "hash", "tags": [],
+                "md_content": f"---\ntitle: {repo['name']}\n---\n"}
+
+    monkeypatch.setattr(daily, "OUTPUT_FOLDER", str(tmp_path))
+    monkeypatch.setattr(daily, "REPO_STATE_FILE", os.path.join(tmp_path, "state.json"))
+    monkeypatch.setattr(daily, "theme", "plain")
+    monkeypatch.setattr(daily, "PIPELINE_WORKERS", 2)
+    monkeypatch.setattr(daily, "build_repo_post", build_repo_post)
+    monkeypatch.setattr(daily, "get_readmes", lambda username, names: {})
+    monkeypatch.setattr(daily, "get_default_images", lambda: ["b.png", "a.png"])
+    monkeypatch.setattr(daily, "optimize_post_assets", lambda paths: None)
+
+    asyncio.run(daily.create_new_markdown_files(repos, "octo-dev"))
+
+    assert seen["fast_post_before_slow_done"]
+    assert seen["default_images"] == ["a.png", "b.png"]
+    assert os.path.exists(os.path.join(tmp_path, "slow.md"))
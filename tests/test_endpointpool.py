@@ -0,0 +1,53 @@
+import time
+
+from endpointpool import EndpointPool
+
+PRIMARY = "https://primary.example"
+BACKUP = "https://backup.example"
+
+
+def test_failed_untimed_endpoint_is_probed_after_cooldown():
+    pool = EndpointPool([PRIMARY, BACKUP], failure_threshold=3, cooldown=0.05)
+    calls = []
+    primary_up = False
+
+    def request(url):
+        calls.append(url)
+        if url == PRIMARY and not primary_up:
+            raise ConnectionError("transient")
+        return url
+
+    # One transient failure on the primary before it ever succeeded
+    assert pool.call(request) == BACKUP
+    assert calls == [PRIMARY, BACKUP]
+    assert pool.endpoints[0].latency is None
+
+    # Within the cooldown the healthy backup keeps the traffic
+    calls.clear()
+    assert pool.call(request) == BACKUP
+    assert calls == [BACKUP]
+
+    # After it the primary is probed again, and once it answers it is ranked
+    # by its latency like any other endpoint instead of staying last
+    time.sleep(0.06)
+    primary_up = True
+    calls.clear()
+    assert pool.call(request) == PRIMARY
+    assert calls == [PRIMARY]
+    assert pool.endpoints[0].latency is not None
+    assert pool.endpoints[0].consecutive_failures == 0
+
+
+def test_failed_untimed_endpoint_scores_finite():
+    pool = EndpointPool([PRIMARY, BACKUP], cooldown=60)
+
+    def request(url):
+        raise ConnectionError("down")
+
+    try:
+        pool.call(request)
+    except ConnectionError:
+        pass
+    # Both failed once and neither was ever timed: still ranked, not dropped
+    assert {e.url for e in pool._ranked()} == {PRIMARY, BACKUP}
+    assert all(e.score() < float("inf") for e in pool.endpoints)
@@ -0,0 +1,136 @@
+"""fetch_repositories_graphql against graphql_replay serving canned pages.
+
+The responses in fixtures/ are handcrafted, not recorded from GitHub: they
+follow the shape of the GraphQL and REST replies for made-up accounts
+(``octo-dev``, ``octo-org`` and the unknown ``ghost-octo``), fetched with
+``page_size=2, commits=3``.  graphql_pages.json lists each page by its
+variables, and the fixture below keys them for the current
+REPOSITORIES_QUERY, so a query change doesn't invalidate them.
+"""
+import json
+import os
+import threading
+
+import pytest
+
+import githubapi
+from githubapi import fetch_repositories_graphql
+from graphql_replay import make_server, request_key
+from httpclient import HTTPClient
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# Fields of a REST repo that create_new_markdown_files and its helpers read
+REST_FIELDS = ("name", "html_url", "description", "stargazers_count",
+               "forks_count", "fork", "pushed_at")
+
+
+@pytest.fixture
+def graphql_url(tmp_path):
+    query = githubapi.REPOSITORIES_QUERY % {"readme_fields": githubapi._readme_fields()}
+    with open(os.path.join(FIXTURES, "graphql_pages.json"), "r", encoding="utf-8") as file:
+        pages = json.load(file)
+    recordings = {
+        request_key({"query": query, "variables": page["variables"]}):
+            {"status": page["status"], "body": page["body"]}
+        for page in pages
+    }
+    path = os.path.join(tmp_path, "graphql_recordings.json")
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(recordings, file)
+    server = make_server(path, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/graphql"
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(graphql_url, login="octo-dev", **kwargs):
+    return fetch_repositories_graphql(
+        HTTPClient(retries=0), login, headers={}, page_size=2, commits=3,
+        graphql_url=graphql_url, **kwargs,
+    )
+
+
+def load_rest_repos():
+    with open(os.path.join(FIXTURES, "rest_repos.json"), "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def test_follows_pagination(graphql_url):
+    repos = fetch(graphql_url)
+    assert [repo["name"] for repo in repos] == [
+        "astro-notes", "dotfiles", "paper-bot", "old-experiment",
+    ]
+
+
+def test_stops_paging_at_pushed_after(graphql_url):
+    repos = fetch(graphql_url, pushed_after="2026-01-01T00:00:00Z")
+    assert [repo["name"] for repo in repos] == ["astro-notes", "dotfiles", "paper-bot"]
+
+
+def test_maps_fields(graphql_url):
+    repos = {repo["name"]: repo for repo in fetch(graphql_url)}
+
+    notes = repos["astro-notes"]
+    assert notes["html_url"] == "https://github.com/octo-dev/astro-notes"
+    assert notes["stargazers_count"] == 42
+    assert notes["forks_count"] == 3
+    assert notes["fork"] is False
+    assert notes["readme"][0] == "# astro-notes\n\nA notes site.\n"
+    # Oldest first, first line of the message, git %ai dates, missing author
+    assert notes["commits"] == [
+        {"hash": "c1" * 20, "author": "Octo Dev", "date": "2026-10-15 07:00:00 +0000",
+         "message": "Initial commit"},
+        {"hash": "c2" * 20, "author": "unknown", "date": "2026-10-16 19:02:11 +0000",
+         "message": "Fix build"},
+        {"hash": "c3" * 20, "author": "Octo Dev", "date": "2026-10-17 08:30:00 +0000",
+         "message": "Add tag pages"},
+    ]
+
+    # README under a later candidate name, no README, no default branch
+    assert repos["dotfiles"]["readme"][0] == "my dotfiles\n"
+    assert repos["dotfiles"]["description"] is None
+    assert repos["paper-bot"]["readme"] is None
+    assert repos["old-experiment"]["commits"] == []
+
+
+def test_matches_rest_listing(graphql_url, monkeypatch):
+    daily = pytest.importorskip("daily_github_appleblog")
+
+    class RecordedPage:
+        status_code = 200
+
+        def __init__(self, data):
+            self.data = data
+
+        def json(self):
+            return self.data
+
+    def github_get(url, headers=None, params=None):
+        return RecordedPage(load_rest_repos() if params["page"] == 1 else [])
+
+    monkeypatch.setattr(daily, "github_get", github_get)
+    rest = list(daily.get_repositories("octo-dev"))
+    graphql = fetch(graphql_url)
+
+    assert len(graphql) == len(rest)
+    for rest_repo, graphql_repo in zip(rest, graphql):
+        for field in REST_FIELDS:
+            assert graphql_repo[field] == rest_repo[field], field
+
+
+def test_skips_private_repos(graphql_url):
+    # The query asks for public repos only; a private one that still comes
+    # back must not end up in a post
+    assert "privacy: PUBLIC" in githubapi.REPOSITORIES_QUERY
+    repos = fetch(graphql_url, login="octo-org")
+    assert [repo["name"] for repo in repos] == ["handbook"]
+
+
+def test_error_payload_returns_none(graphql_url):
+    assert fetch(graphql_url, login="ghost-octo") is None
+
+
+def test_unrecorded_request_returns_none(graphql_url):
+    assert fetch(graphql_url, login="nobody-recorded") is None
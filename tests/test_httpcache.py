@@ -0,0 +1,64 @@
+import os
+import threading
+
+from httpcache import ConditionalHTTPCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", etag=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = {"ETag": etag} if etag else {}
+
+
+class FakeSession:
+    """Serves every URL with an ETag and answers matching conditionals with 304."""
+
+    def get(self, url, headers=None, **kwargs):
+        etag = f'"{url}"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, url.encode("utf-8"), etag)
+
+
+def test_evicts_least_recently_used_past_max_entries(tmp_path):
+    cache = ConditionalHTTPCache(os.path.join(tmp_path, "http.sqlite"),
+                                 session=FakeSession(), max_entries=2)
+    cache.get("https://api.example/a")
+    cache.get("https://api.example/b")
+    # Served from cache, which makes /a the most recently used
+    assert cache.get("https://api.example/a").from_cache
+    cache.get("https://api.example/c")
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert cache.get("https://api.example/a").from_cache
+    assert not getattr(cache.get("https://api.example/b"), "from_cache", False)
+
+
+def test_drops_entries_past_ttl(tmp_path):
+    cache = ConditionalHTTPCache(os.path.join(tmp_path, "http.sqlite"),
+                                 session=FakeSession(), ttl_seconds=60)
+    cache.get("https://api.example/old")
+    with cache._lock:
+        cache._conn.execute("UPDATE responses SET accessed_at = accessed_at - 120")
+    cache.get("https://api.example/new")
+    assert cache.stats()["entries"] == 1
+
+
+def test_counters_are_exact_across_threads(tmp_path):
+    cache = ConditionalHTTPCache(os.path.join(tmp_path, "http.sqlite"), session=FakeSession())
+
+    def fetch(worker):
+        for index in range(50):
+            cache.get(f"https://api.example/{worker}/{index % 5}")
+
+    threads = [threading.Thread(target=fetch, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats["requests"] == 400
+    assert stats["stored"] + stats["not_modified"] == 400
@@ -0,0 +1,80 @@
+import asyncio
+import os
+
+import pytest
+
+from llmcache import LLMCache
+
+daily = pytest.importorskip("daily_github_appleblog")
+
+TEXT = "astro-notes A notes site built with Astro"
+JSON_PROMPT = daily.KEYWORDS_AND_TAGS_PROMPT.format(text=TEXT)
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = LLMCache(os.path.join(tmp_path, "cache.sqlite"))
+    monkeypatch.setattr(daily, "get_default_cache", lambda: cache)
+    monkeypatch.setattr(daily, "KEYWORD_EXTRACTION", "json")
+    return cache
+
+
+def answer_with(monkeypatch, json_reply):
+    # The combined prompt gets json_reply, the fallback prompts plain lists
+    prompts = []
+
+    def request(prompt, retries=3, delay=5):
+        prompts.append(prompt)
+        if prompt == JSON_PROMPT:
+            return json_reply
+        if prompt.startswith("Extract keywords"):
+            return "keywords: notes, static site"
+        return "tags: Web Dev, Astro"
+
+    monkeypatch.setattr(daily, "_openai_api_request", request)
+    return prompts
+
+
+def extract():
+    return asyncio.run(daily.extract_keywords_and_tags(TEXT))
+
+
+def test_parse_plain_json():
+    reply = '{"keywords": ["astro", "notes"], "tags": "Web Dev, Astro"}'
+    assert daily.parse_keywords_and_tags(reply) == (["astro", "notes"], ["Web Dev", "Astro"])
+
+
+def test_parse_fenced_json():
+    reply = 'Here you go:\n```json\n{"keywords": ["astro"], "tags": ["notes"]}\n```'
+    assert daily.parse_keywords_and_tags(reply) == (["astro"], ["notes"])
+
+
+@pytest.mark.parametrize("reply", [
+    None,
+    "",
+    "keywords: astro, notes",
+    '{"keywords": ["astro", "tags": []}',
+    '{"keywords": [], "tags": []}',
+    '["astro"]',
+])
+def test_parse_rejects_unusable_replies(reply):
+    assert daily.parse_keywords_and_tags(reply) is None
+
+
+def test_extract_from_json_reply_is_cached(cache, monkeypatch):
+    prompts = answer_with(monkeypatch, '{"keywords": ["astro"], "tags": ["Static Site"]}')
+    assert extract() == (["astro"], ["static-site"])
+    assert extract() == (["astro"], ["static-site"])
+    assert prompts == [JSON_PROMPT]
+
+
+@pytest.mark.parametrize("reply", ['{"keywords": ["astro",', None])
+def test_extract_falls_back_without_caching_bad_reply(cache, monkeypatch, reply):
+    prompts = answer_with(monkeypatch, reply)
+    assert extract() == (["notes", "static site"], ["web-dev", "astro"])
+    assert cache.get(daily.api_model, JSON_PROMPT, None) is None
+
+    # A later run asks again instead of replaying the bad reply
+    prompts.clear()
+    extract()
+    assert prompts[0] == JSON_PROMPT
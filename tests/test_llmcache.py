@@ -0,0 +1,32 @@
+import os
+
+from llmcache import LLMCache
+
+
+def is_json_object(reply):
+    return reply.strip().startswith("{")
+
+
+def test_max_tokens_is_part_of_the_key(tmp_path):
+    cache = LLMCache(os.path.join(tmp_path, "cache.sqlite"))
+    cache.set("model", "prompt", 0.7, "short", max_tokens=50)
+    assert cache.get("model", "prompt", 0.7, max_tokens=50) == "short"
+    assert cache.get("model", "prompt", 0.7, max_tokens=1024) is None
+
+
+def test_invalid_reply_is_not_stored(tmp_path):
+    cache = LLMCache(os.path.join(tmp_path, "cache.sqlite"))
+    reply = cache.get_or_call("model", "prompt", None, lambda: "not json",
+                              validate=is_json_object)
+    assert reply == "not json"
+    assert cache.get("model", "prompt", None) is None
+
+
+def test_invalid_cached_reply_is_fetched_again(tmp_path):
+    cache = LLMCache(os.path.join(tmp_path, "cache.sqlite"))
+    # Stored by a run that didn't validate yet
+    cache.set("model", "prompt", None, "not json")
+    reply = cache.get_or_call("model", "prompt", None, lambda: '{"tags": []}',
+                              validate=is_json_object)
+    assert reply == '{"tags": []}'
+    assert cache.get("model", "prompt", None) == '{"tags": []}'
@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pipelinehelper import RepoPipeline
+
+
+class Gauge:
+    """Counts how many calls of one stage run at the same time."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def __call__(self, value):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+        return value
+
+
+def test_stage_limits_bound_concurrency():
+    pipeline = RepoPipeline(workers=6, stage_limits={"blog": 2, "image": 1})
+    blog, image = Gauge(), Gauge()
+
+    async def process(item):
+        return await asyncio.gather(
+            pipeline.run("blog", blog, item), pipeline.run("image", image, -item)
+        )
+
+    try:
+        results = asyncio.run(pipeline.map(process, range(6)))
+    finally:
+        pipeline.shutdown()
+
+    assert results == [[item, -item] for item in range(6)]
+    assert blog.peak == 2
+    assert image.peak == 1
+
+
+def test_workers_bound_items_in_flight():
+    pipeline = RepoPipeline(workers=2, stage_limits={"blog": 8})
+    blog = Gauge()
+    try:
+        asyncio.run(pipeline.map(lambda item: pipeline.run("blog", blog, item), range(6)))
+    finally:
+        pipeline.shutdown()
+    assert blog.peak == 2
+
+
+def test_failing_item_returns_its_exception():
+    pipeline = RepoPipeline(workers=3)
+
+    def fetch(item):
+        if item == 1:
+            raise ValueError("readme missing")
+        return item * 10
+
+    try:
+        results = asyncio.run(
+            pipeline.map(lambda item: pipeline.run("readme", fetch, item), range(3))
+        )
+    finally:
+        pipeline.shutdown()
+
+    assert results[0] == 0 and results[2] == 20
+    assert isinstance(results[1], ValueError)
+
+
+def test_run_raises_stage_errors():
+    pipeline = RepoPipeline()
+
+    def fail():
+        raise RuntimeError("endpoint down")
+
+    try:
+        with pytest.raises(RuntimeError, match="endpoint down"):
+            asyncio.run(pipeline.run("blog", fail))
+    finally:
+        pipeline.shutdown()
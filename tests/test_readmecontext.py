@@ -0,0 +1,20 @@
+from readmecontext import ReadmeContext, condense_readme, estimate_tokens
+
+
+def test_short_multi_paragraph_section_stays_whole():
+    small = "\n\n".join(f"Point {i}." for i in range(6))
+    long = " ".join(["This sentence pads out the long section."] * 200)
+    readme = f"# Tool\n\nIntro line.\n\n## Small\n\n{small}\n\n## Long\n\n{long}\n"
+
+    context = condense_readme(readme, 400)
+
+    assert small in context
+    assert "## Long" in context
+    assert estimate_tokens(context) <= 400
+
+
+def test_readme_under_budget_is_only_cleaned():
+    readme = "# Tool\n\n[![CI](https://ci/badge.svg)](https://ci)\n\nSee [the docs](https://docs).\n"
+    context = ReadmeContext(readme, max_tokens=1500)
+    assert context.text == "# Tool\n\nSee the docs."
+    assert context.source_tokens > context.tokens
@@ -0,0 +1,43 @@
+import json
+import os
+import stat
+
+from tagindex import TagIndex
+
+
+def lowercase(tags):
+    return [tag.strip().lower() for tag in tags if tag.strip()]
+
+
+def write_index(path, data):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+
+
+def test_loaded_tags_round_trip_unchanged(tmp_path):
+    path = os.path.join(tmp_path, "tags.json")
+    write_index(path, {
+        "tags": ["Emotional-Adventure", "LLM", "rust"],
+        "posts": {"astro-notes": ["Astro", "Static-Site"]},
+    })
+
+    index = TagIndex(path, normalize=lowercase)
+    data = index.to_dict()
+
+    assert data["tags"] == ["Astro", "Emotional-Adventure", "LLM", "Static-Site", "rust"]
+    assert data["posts"] == {"astro-notes": ["Astro", "Static-Site"]}
+
+
+def test_only_added_tags_are_normalized(tmp_path):
+    path = os.path.join(tmp_path, "tags.json")
+    write_index(path, {"tags": ["Emotional-Adventure"]})
+
+    index = TagIndex(path, normalize=lowercase)
+    assert index.add("paper-bot", [" ArXiv ", "Digest"]) == ["arxiv", "digest"]
+    index.save()
+
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    assert data["tags"] == ["Emotional-Adventure", "arxiv", "digest"]
+    assert data["counts"]["Emotional-Adventure"] == 0
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644